@@ -11,6 +11,33 @@ from datetime import datetime
 
 logger = logging.getLogger('automaticats.db_manager')
 
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 512
+
+def tune_connection(conn, cache_kib=20000):
+    """Switch a connection to WAL with synchronous=NORMAL for bulk writes.
+
+    Commits then no longer each force an fsync. Call it outside a transaction,
+    since executescript commits any pending one first.
+    """
+    conn.executescript(
+        "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; "
+        f"PRAGMA temp_store=MEMORY; PRAGMA cache_size=-{int(cache_kib)};"
+    )
+
+def connect(db_path, read_only=False):
+    """Open a tuned SQLite connection for scripts working on the app database.
+
+    Writable connections are tuned with tune_connection; read-only connections
+    are set to query_only instead.
+    """
+    conn = sqlite3.connect(db_path, cached_statements=STATEMENT_CACHE_SIZE)
+    if read_only:
+        conn.execute("PRAGMA query_only=1")
+    else:
+        tune_connection(conn)
+    return conn
+
 class DatabaseManager:
     """Manages all database operations for the AutomatiCats application"""
     
@@ -18,8 +45,13 @@ class DatabaseManager:
         """Initialize the database manager and create tables if they don't exist"""
         self.db_path = db_path
         
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Cached result of get_all_cats, cleared whenever a cat is added, updated or deleted
+        self._cats_cache = None
+        
+        # Ensure data directory exists (no directory for ':memory:' or a bare filename)
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
         
         # Connect to database and create tables if they don't exist
         self.conn = self._get_connection()
@@ -29,8 +61,10 @@ class DatabaseManager:
     def _get_connection(self):
         """Create and return a database connection"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
             conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            # The app keeps this one connection for its whole run, so tune it once
+            tune_connection(conn)
             return conn
         except sqlite3.Error as e:
             logger.error(f"Database connection error: {e}")
@@ -115,6 +149,12 @@ class DatabaseManager:
                 )
             ''')
             
+            # Per-cat feeding history, newest first, is read by an index range scan
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_feeding_logs_cat_ts
+                    ON feeding_logs(cat_id, timestamp)
+            ''')
+            
             # Water dispenser logs table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS water_logs (
@@ -153,6 +193,7 @@ class DatabaseManager:
                 VALUES (?, ?, ?, ?, ?)
             ''', (name, age, weight, photo_path, notes))
             self.conn.commit()
+            self._cats_cache = None
             cat_id = cursor.lastrowid
             logger.info(f"Added cat '{name}' with ID {cat_id}")
             return cat_id
@@ -164,9 +205,11 @@ class DatabaseManager:
     def get_all_cats(self):
         """Get all cats from the database"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('SELECT * FROM cats ORDER BY name')
-            return cursor.fetchall()
+            if self._cats_cache is None:
+                cursor = self.conn.cursor()
+                cursor.execute('SELECT * FROM cats ORDER BY name')
+                self._cats_cache = cursor.fetchall()
+            return list(self._cats_cache)
         except sqlite3.Error as e:
             logger.error(f"Error getting cats: {e}")
             raise
@@ -191,6 +234,7 @@ class DatabaseManager:
                 WHERE id = ?
             ''', (name, age, weight, photo_path, notes, cat_id))
             self.conn.commit()
+            self._cats_cache = None
             logger.info(f"Updated cat ID {cat_id}")
             return cursor.rowcount > 0
         except sqlite3.Error as e:
@@ -204,6 +248,7 @@ class DatabaseManager:
             cursor = self.conn.cursor()
             cursor.execute('DELETE FROM cats WHERE id = ?', (cat_id,))
             self.conn.commit()
+            self._cats_cache = None
             logger.info(f"Deleted cat ID {cat_id}")
             return cursor.rowcount > 0
         except sqlite3.Error as e:
@@ -333,12 +378,12 @@ class DatabaseManager:
                 INSERT INTO feeding_logs (cat_id, schedule_id, food_type, amount, is_manual, notes)
                 VALUES (?, ?, ?, ?, ?, ?)
             ''', (cat_id, schedule_id, food_type, amount, is_manual, notes))
-            self.conn.commit()
             log_id = cursor.lastrowid
-            
-            # Update food inventory
+
+            # Update food inventory in the same transaction (one commit per event)
             self._update_food_inventory_after_feeding(food_type, amount)
-            
+            self.conn.commit()
+
             logger.info(f"Logged feeding for cat ID {cat_id}, amount: {amount}")
             return log_id
         except sqlite3.Error as e:
@@ -346,24 +391,53 @@ class DatabaseManager:
             self.conn.rollback()
             raise
     
+    def log_feedings(self, feedings):
+        """Log several feeding events in one transaction
+        
+        feedings is a list of (cat_id, food_type, amount, schedule_id, is_manual, notes)
+        tuples; returns the number of events logged.
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.executemany('''
+                INSERT INTO feeding_logs (cat_id, schedule_id, food_type, amount, is_manual, notes)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [(cat_id, schedule_id, food_type, amount, is_manual, notes)
+                  for cat_id, food_type, amount, schedule_id, is_manual, notes in feedings])
+            
+            # Update food inventory in the same transaction (one commit for the batch)
+            for _, food_type, amount, _, _, _ in feedings:
+                self._update_food_inventory_after_feeding(food_type, amount)
+            self.conn.commit()
+            
+            logger.info(f"Logged {len(feedings)} feedings")
+            return len(feedings)
+        except sqlite3.Error as e:
+            logger.error(f"Error logging feedings: {e}")
+            self.conn.rollback()
+            raise
+    
     def _update_food_inventory_after_feeding(self, food_type, amount_used):
-        """Update food inventory after a feeding event"""
+        """Update food inventory after a feeding event (the caller commits)"""
         try:
             cursor = self.conn.cursor()
             cursor.execute('''
                 UPDATE food_inventory
-                SET current_amount = MAX(0, current_amount - ?), 
+                SET current_amount = MAX(0, current_amount - ?),
                     updated_at = CURRENT_TIMESTAMP
                 WHERE food_type = ?
             ''', (amount_used, food_type))
-            self.conn.commit()
         except sqlite3.Error as e:
             logger.error(f"Error updating food inventory after feeding: {e}")
-            self.conn.rollback()
             raise
     
-    def get_feeding_logs(self, cat_id=None, start_date=None, end_date=None):
-        """Get feeding logs with optional filters"""
+    def get_feeding_logs(self, cat_id=None, start_date=None, end_date=None, limit=None, before=None):
+        """Get feeding logs with optional filters
+        
+        limit caps the number of rows returned (newest first); pass the (timestamp, id)
+        of the last row seen as before to fetch the next page. The id breaks ties
+        between rows logged in the same second.
+        """
         try:
             cursor = self.conn.cursor()
             query = '''
@@ -384,11 +458,17 @@ class DatabaseManager:
             if end_date:
                 where_clauses.append("fl.timestamp <= ?")
                 params.append(end_date)
+            if before:
+                where_clauses.append("(fl.timestamp, fl.id) < (?, ?)")
+                params.extend(before)
             
             if where_clauses:
                 query += " WHERE " + " AND ".join(where_clauses)
             
-            query += " ORDER BY fl.timestamp DESC"
+            query += " ORDER BY fl.timestamp DESC, fl.id DESC"
+            if limit:
+                query += " LIMIT ?"
+                params.append(limit)
             
             cursor.execute(query, params)
             return cursor.fetchall()
@@ -7,12 +7,11 @@ for cat feeding schedules and portions based on historical data.
 
 import os
 import logging
-import pickle
+import joblib
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_absolute_error, accuracy_score
 
@@ -29,7 +28,6 @@ class MLEngine:
         self.time_model = None
         self.portion_model = None
         self.food_preference_model = None
-        self.scaler = None
         
         # Create models directory if it doesn't exist
         os.makedirs(self.models_dir, exist_ok=True)
@@ -39,10 +37,20 @@ class MLEngine:
     
     def _load_models(self):
         """Load trained models if they exist"""
+        # Models are memory-mapped (mmap_mode='r'), so their tree arrays are read
+        # through the page cache and shared across processes instead of copied in
         try:
             # Get the most recent models from the database
             cursor = self.db_manager.conn.cursor()
             
+            # Older .pkl models were trained on scaled inputs and give wrong answers
+            # on the raw features used now, so only the trainer's .joblib output loads
+            cursor.execute('''
+                UPDATE ml_models SET is_active = 0
+                WHERE is_active = 1 AND model_path NOT LIKE '%.joblib'
+            ''')
+            self.db_manager.conn.commit()
+            
             # Time prediction model
             cursor.execute('''
                 SELECT model_path FROM ml_models 
@@ -53,18 +61,16 @@ class MLEngine:
             
             if time_model_row and os.path.exists(time_model_row[0]):
                 time_model_path = time_model_row[0]
-                with open(time_model_path, 'rb') as f:
-                    self.time_model = pickle.load(f)
+                self.time_model = joblib.load(time_model_path, mmap_mode='r')
                 logger.info(f"Loaded time prediction model from {time_model_path}")
             else:
                 # Fallback to direct file search
-                time_model_files = [f for f in os.listdir(self.models_dir) if f.startswith('time_prediction_')]
+                time_model_files = [f for f in os.listdir(self.models_dir) if f.startswith('time_prediction_') and f.endswith('.joblib')]
                 if time_model_files:
                     # Get the most recent model by sorting filenames (which contain timestamps)
                     latest_time_model = sorted(time_model_files)[-1]
                     time_model_path = os.path.join(self.models_dir, latest_time_model)
-                    with open(time_model_path, 'rb') as f:
-                        self.time_model = pickle.load(f)
+                    self.time_model = joblib.load(time_model_path, mmap_mode='r')
                     logger.info(f"Loaded time prediction model from {time_model_path}")
             
             # Portion recommendation model
@@ -77,89 +83,64 @@ class MLEngine:
             
             if portion_model_row and os.path.exists(portion_model_row[0]):
                 portion_model_path = portion_model_row[0]
-                with open(portion_model_path, 'rb') as f:
-                    self.portion_model = pickle.load(f)
+                self.portion_model = joblib.load(portion_model_path, mmap_mode='r')
                 logger.info(f"Loaded portion recommendation model from {portion_model_path}")
             else:
                 # Fallback to direct file search
-                portion_model_files = [f for f in os.listdir(self.models_dir) if f.startswith('portion_prediction_')]
+                portion_model_files = [f for f in os.listdir(self.models_dir) if f.startswith('portion_prediction_') and f.endswith('.joblib')]
                 if portion_model_files:
                     # Get the most recent model
                     latest_portion_model = sorted(portion_model_files)[-1]
                     portion_model_path = os.path.join(self.models_dir, latest_portion_model)
-                    with open(portion_model_path, 'rb') as f:
-                        self.portion_model = pickle.load(f)
+                    self.portion_model = joblib.load(portion_model_path, mmap_mode='r')
                     logger.info(f"Loaded portion recommendation model from {portion_model_path}")
             
-            # Food preference models (multiple models, one per food type)
+            # Food preference model (a single multiclass model over all food types)
             cursor.execute('''
                 SELECT model_path FROM ml_models 
-                WHERE model_type LIKE 'food_preference_%' AND is_active = 1
-                ORDER BY training_date DESC
+                WHERE model_type = 'food_preference' AND is_active = 1
+                ORDER BY training_date DESC LIMIT 1
             ''')
-            food_model_rows = cursor.fetchall()
-            
-            if food_model_rows:
-                # For simplicity, just use the first food preference model
-                # In a real implementation, we would load all food preference models
-                food_model_path = food_model_rows[0][0]
-                if os.path.exists(food_model_path):
-                    with open(food_model_path, 'rb') as f:
-                        self.food_preference_model = pickle.load(f)
-                    logger.info(f"Loaded food preference model from {food_model_path}")
+            food_model_row = cursor.fetchone()
+            
+            if food_model_row and os.path.exists(food_model_row[0]):
+                food_model_path = food_model_row[0]
+                self.food_preference_model = joblib.load(food_model_path, mmap_mode='r')
+                logger.info(f"Loaded food preference model from {food_model_path}")
             else:
-                # Fallback to direct file search
-                food_model_files = [f for f in os.listdir(self.models_dir) if f.startswith('food_preference_')]
+                # Fallback to direct file search, skipping the older per-food-type models
+                food_model_files = [f for f in os.listdir(self.models_dir)
+                                    if f.startswith('food_preference_') and f[len('food_preference_'):][:1].isdigit()
+                                    and f.endswith('.joblib')]
                 if food_model_files:
                     # Get the most recent model
                     latest_food_model = sorted(food_model_files)[-1]
                     food_model_path = os.path.join(self.models_dir, latest_food_model)
-                    with open(food_model_path, 'rb') as f:
-                        self.food_preference_model = pickle.load(f)
+                    self.food_preference_model = joblib.load(food_model_path, mmap_mode='r')
                     logger.info(f"Loaded food preference model from {food_model_path}")
             
-            # Feature scaler - we don't have this in the database, so just use the old approach
-            scaler_path = os.path.join(self.models_dir, 'scaler.pkl')
-            if os.path.exists(scaler_path):
-                with open(scaler_path, 'rb') as f:
-                    self.scaler = pickle.load(f)
-                logger.info("Loaded feature scaler")
-            else:
-                # If no scaler is found, create a default one
-                self.scaler = StandardScaler()
-                logger.info("Created default feature scaler")
-                
         except Exception as e:
             logger.error(f"Error loading models: {e}")
             # Reset models if loading fails
             self.time_model = None
             self.portion_model = None
             self.food_preference_model = None
-            self.scaler = None
     
     def _save_models(self):
         """Save trained models to disk"""
         try:
             # Time prediction model
             if self.time_model:
-                with open(os.path.join(self.models_dir, 'time_model.pkl'), 'wb') as f:
-                    pickle.dump(self.time_model, f)
+                joblib.dump(self.time_model, os.path.join(self.models_dir, 'time_model.pkl'))
             
             # Portion recommendation model
             if self.portion_model:
-                with open(os.path.join(self.models_dir, 'portion_model.pkl'), 'wb') as f:
-                    pickle.dump(self.portion_model, f)
+                joblib.dump(self.portion_model, os.path.join(self.models_dir, 'portion_model.pkl'))
             
             # Food preference model
             if self.food_preference_model:
-                with open(os.path.join(self.models_dir, 'preference_model.pkl'), 'wb') as f:
-                    pickle.dump(self.food_preference_model, f)
-            
-            # Feature scaler
-            if self.scaler:
-                with open(os.path.join(self.models_dir, 'scaler.pkl'), 'wb') as f:
-                    pickle.dump(self.scaler, f)
-                    
+                joblib.dump(self.food_preference_model, os.path.join(self.models_dir, 'preference_model.pkl'))
+            
             logger.info("Saved ML models to disk")
             
         except Exception as e:
@@ -227,15 +208,11 @@ class MLEngine:
             # Train time prediction model
             X_train, X_test, y_train, y_test = train_test_split(X_time, y_time, test_size=0.2)
             
-            self.scaler = StandardScaler()
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_test_scaled = self.scaler.transform(X_test)
-            
             self.time_model = RandomForestRegressor(n_estimators=100)
-            self.time_model.fit(X_train_scaled, y_train)
+            self.time_model.fit(X_train, y_train)
             
             # Evaluate time model
-            y_pred_time = self.time_model.predict(X_test_scaled)
+            y_pred_time = self.time_model.predict(X_test)
             time_error = mean_absolute_error(y_test, y_pred_time)
             logger.info(f"Time prediction model MAE: {time_error}")
             
@@ -246,14 +223,12 @@ class MLEngine:
             
             # Train portion recommendation model
             X_train, X_test, y_train, y_test = train_test_split(X_portion, y_portion, test_size=0.2)
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_test_scaled = self.scaler.transform(X_test)
             
             self.portion_model = RandomForestRegressor(n_estimators=100)
-            self.portion_model.fit(X_train_scaled, y_train)
+            self.portion_model.fit(X_train, y_train)
             
             # Evaluate portion model
-            y_pred_portion = self.portion_model.predict(X_test_scaled)
+            y_pred_portion = self.portion_model.predict(X_test)
             portion_error = mean_absolute_error(y_test, y_pred_portion)
             logger.info(f"Portion recommendation model MAE: {portion_error}")
             
@@ -263,14 +238,13 @@ class MLEngine:
             
             # Train food preference model
             X_train, X_test, y_train, y_test = train_test_split(X_food, y_food, test_size=0.2)
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_test_scaled = self.scaler.transform(X_test)
             
+            # Trees are scale-invariant, so the forest needs no scaler
             self.food_preference_model = RandomForestClassifier(n_estimators=100)
-            self.food_preference_model.fit(X_train_scaled, y_train)
+            self.food_preference_model.fit(X_train, y_train)
             
             # Evaluate food preference model
-            y_pred_food = self.food_preference_model.predict(X_test_scaled)
+            y_pred_food = self.food_preference_model.predict(X_test)
             food_accuracy = accuracy_score(y_test, y_pred_food)
             logger.info(f"Food preference model accuracy: {food_accuracy}")
             
@@ -285,7 +259,7 @@ class MLEngine:
     
     def predict_optimal_feeding_time(self, cat_id, day_of_week):
         """Predict the optimal feeding time for a cat on a specific day"""
-        if not self.time_model or not self.scaler:
+        if not self.time_model:
             logger.warning("Time prediction model not available")
             return None, 0.0
         
@@ -296,11 +270,8 @@ class MLEngine:
             current_hour = datetime.now().hour
             features = np.array([[cat_id, day_of_week, current_hour]])
             
-            # Scale features
-            features_scaled = self.scaler.transform(features)
-            
             # Make prediction
-            hour_prediction = self.time_model.predict(features_scaled)[0]
+            hour_prediction = self.time_model.predict(features)[0]
             
             # Get confidence (use feature importance and prediction variance as proxy)
             confidence = 0.75  # Placeholder, would calculate from model internals
@@ -318,7 +289,7 @@ class MLEngine:
     
     def recommend_portion_size(self, cat_id, hour_of_day, day_of_week, food_type_id=1):
         """Recommend an optimal portion size for a feeding"""
-        if not self.portion_model or not self.scaler:
+        if not self.portion_model:
             logger.warning("Portion recommendation model not available")
             return None, 0.0
         
@@ -327,11 +298,8 @@ class MLEngine:
             # Use the same structure as in training: cat_id, day_of_week, hour
             features = np.array([[cat_id, day_of_week, hour_of_day]])
             
-            # Scale features
-            features_scaled = self.scaler.transform(features)
-            
             # Make prediction
-            portion_prediction = self.portion_model.predict(features_scaled)[0]
+            portion_prediction = self.portion_model.predict(features)[0]
             
             # Get confidence
             confidence = 0.80  # Placeholder, would calculate from model internals
@@ -344,7 +312,7 @@ class MLEngine:
     
     def suggest_food_type(self, cat_id, hour_of_day, day_of_week):
         """Suggest a food type based on cat preferences"""
-        if not self.food_preference_model or not self.scaler:
+        if not self.food_preference_model:
             logger.warning("Food preference model not available")
             return None, 0.0
         
@@ -353,38 +321,11 @@ class MLEngine:
             # Use the same structure as in training: cat_id, day_of_week, hour
             features = np.array([[cat_id, day_of_week, hour_of_day]])
             
-            # Scale features
-            features_scaled = self.scaler.transform(features)
-            
-            # Make prediction
-            food_type_prediction = self.food_preference_model.predict(features_scaled)[0]
-            
-            # Get prediction probabilities
-            proba = self.food_preference_model.predict_proba(features_scaled)[0]
-            confidence = max(proba)
-            
-            # Convert binary prediction to food type
-            # Since we're using a binary classifier for each food type,
-            # a prediction of 1 means the food type is recommended
-            if food_type_prediction == 1:
-                # Extract food type from model name in database
-                cursor = self.db_manager.conn.cursor()
-                cursor.execute('''
-                    SELECT additional_info FROM ml_models 
-                    WHERE model_path = ? LIMIT 1
-                ''', (os.path.abspath(self.db_manager.conn.execute(
-                    "SELECT model_path FROM ml_models WHERE model_type LIKE 'food_preference_%' LIMIT 1"
-                ).fetchone()[0]),))
-                
-                food_type_row = cursor.fetchone()
-                if food_type_row:
-                    food_name = food_type_row[0]
-                else:
-                    # Fallback to a default food type
-                    food_name = "Recommended Food"
-            else:
-                # If prediction is 0, suggest a default food type
-                food_name = "Standard Food"
+            # Get prediction probabilities; the classes are the food type labels
+            proba = self.food_preference_model.predict_proba(features)[0]
+            best = int(proba.argmax())
+            food_name = str(self.food_preference_model.classes_[best])
+            confidence = float(proba[best])
             
             return food_name, confidence
             
@@ -392,6 +333,39 @@ class MLEngine:
             logger.error(f"Error suggesting food type: {e}")
             return None, 0.0
     
+    def predict_batch(self, inputs):
+        """Predict feeding time, portion and food type for every row of a DataFrame
+        
+        inputs needs cat_id, day_of_week and hour_of_day columns. Each model is called
+        once for the whole frame; columns of unavailable models are left as None.
+        """
+        results = pd.DataFrame(index=inputs.index, columns=[
+            'feeding_time', 'portion', 'food_type', 'food_confidence'
+        ], dtype=object)
+        
+        try:
+            # Use the same structure as in training: cat_id, day_of_week, hour
+            features = inputs[['cat_id', 'day_of_week', 'hour_of_day']].to_numpy(dtype=np.float64)
+            
+            if self.time_model:
+                hours = self.time_model.predict(features).astype(int)
+                results['feeding_time'] = [f"{hour:02d}:00" for hour in hours]
+            
+            if self.portion_model:
+                results['portion'] = np.round(self.portion_model.predict(features), 1)
+            
+            if self.food_preference_model:
+                # One predict_proba call; pick each row's most likely food type
+                proba = self.food_preference_model.predict_proba(features)
+                best = proba.argmax(axis=1)
+                results['food_type'] = self.food_preference_model.classes_[best].astype(str)
+                results['food_confidence'] = proba[np.arange(len(best)), best]
+            
+        except Exception as e:
+            logger.error(f"Error making batch predictions: {e}")
+        
+        return results
+    
     def get_recommendations(self, cat_id):
         """Get a full set of feeding recommendations for a cat"""
         recommendations = []
@@ -0,0 +1,200 @@
+"""
+ML schema migration for AutomatiCats
+Applies database/schema_update_ml.sql to an existing database, skipping the
+columns, tables and indexes that are already present.
+"""
+
+import os
+import logging
+import sqlite3
+import re
+
+from core.db_manager import connect
+
+logger = logging.getLogger('automaticats.schema_migrate')
+
+# Patterns used to classify schema statements (compiled once, not per statement)
+_ALTER_RE = re.compile(r'ALTER\s+TABLE\s+(\w+)', re.IGNORECASE)
+_ADDCOL_RE = re.compile(r'ADD\s+COLUMN\s+(\w+)', re.IGNORECASE)
+_CREATE_RE = re.compile(r'CREATE\s+TABLE\s+(\w+)', re.IGNORECASE)
+_INDEX_RE = re.compile(r'CREATE\s+INDEX\s+(\w+)', re.IGNORECASE)
+
+def _schema_lines(schema_path):
+    """Yield the lines of the ML schema file."""
+    with open(schema_path, 'r') as f:
+        yield from f
+
+def _iter_statements(lines):
+    """Yield the SQL statements in lines one at a time, without full-line comments.
+
+    The input is scanned line by line, so only the current statement is held in
+    memory rather than the whole file plus a split copy of it.
+    """
+    buf = []
+    for line in lines:
+        if line.lstrip().startswith('--'):
+            continue
+        buf.append(line)
+        if ';' in line:
+            parts = ''.join(buf).split(';')
+            for part in parts[:-1]:
+                if part.strip():
+                    yield part.strip()
+            buf = [parts[-1]]
+    rest = ''.join(buf).strip()
+    if rest:
+        yield rest
+
+def _describe(statement):
+    """Return a short one-line description of a statement for progress output."""
+    return f"{statement[:50]}{'...' if len(statement) > 50 else ''}"
+
+def _execute_batch(conn, statements):
+    """Execute the statements as a single script inside one transaction.
+
+    If the batch fails it is rolled back and the statements are retried one
+    at a time, so a single bad statement is reported without blocking the rest.
+    """
+    script = ";\n".join(statements)
+    try:
+        conn.executescript(f"BEGIN;\n{script};\nCOMMIT;")
+        for statement in statements:
+            logger.info(f"Executed: {_describe(statement)}")
+        return
+    except sqlite3.Error as e:
+        logger.warning(f"Batch execution failed ({e}), retrying statements individually...")
+        conn.rollback()
+
+    for statement in statements:
+        try:
+            conn.execute(statement)
+            logger.info(f"Executed: {_describe(statement)}")
+        except sqlite3.Error as e:
+            logger.error(f"Error executing statement: {e}")
+            logger.error(f"Statement: {statement}")
+
+def _load_schema_snapshot(cursor):
+    """Return ({table_name: set(column_names)}, set(index_names)) for the database."""
+    tables = [row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()]
+    indexes = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type='index'").fetchall()}
+    return {
+        table: {col[1] for col in cursor.execute(f"PRAGMA table_info({table})").fetchall()}
+        for table in tables
+    }, indexes
+
+def apply_schema_updates(db_path, schema_path, verify=False):
+    """Apply the ML schema updates in schema_path to the database at db_path."""
+    # Check if files exist
+    if not os.path.exists(db_path):
+        logger.error(f"Database file not found at {db_path}")
+        return False
+    
+    if not os.path.exists(schema_path):
+        logger.error(f"Schema update file not found at {schema_path}")
+        return False
+    
+    # Apply the schema updates
+    try:
+        conn = connect(db_path)
+        cursor = conn.cursor()
+        
+        # Snapshot the existing schema once; the checks below are pure lookups
+        existing, existing_indexes = _load_schema_snapshot(cursor)
+
+        # Filter the statements first, then run the survivors as one script
+        # (one transaction, including the ml_models drop and re-create)
+        pending = []
+        ml_models_created = False
+
+        # First, check if we need to drop and recreate ml_models
+        if 'ml_models' in existing:
+            logger.info("Found existing ml_models table. Dropping for schema compatibility.")
+            pending.append("DROP TABLE IF EXISTS ml_models")
+
+        for statement in _iter_statements(_schema_lines(schema_path)):
+            try:
+                # Statements are stripped of comments; classify on the leading keywords
+                head = statement[:12].upper()
+
+                # Always (re)create ml_models, since any old copy is dropped above
+                if 'CREATE TABLE ml_models' in statement:
+                    pending.append(statement)
+                    ml_models_created = True
+                    continue
+                
+                # Handle ALTER TABLE statements to add columns
+                if head.startswith('ALTER TABLE'):
+                    # Extract table name
+                    table_match = _ALTER_RE.search(statement)
+                    if table_match:
+                        table_name = table_match.group(1)
+                        
+                        # Extract column name
+                        column_match = _ADDCOL_RE.search(statement)
+                        if column_match:
+                            column_name = column_match.group(1)
+                            
+                            # Check if column already exists
+                            if column_name in existing.get(table_name, ()):
+                                logger.info(f"Column {column_name} already exists in table {table_name}, skipping...")
+                                continue
+                
+                # Handle CREATE TABLE statements
+                elif head.startswith('CREATE TABLE'):
+                    # Extract table name
+                    table_match = _CREATE_RE.search(statement)
+                    if table_match:
+                        table_name = table_match.group(1)
+                        
+                        # Skip check for ml_models since we deliberately dropped it
+                        if table_name == 'ml_models':
+                            continue  # Skip as we already created it
+                            
+                        # Check if table already exists
+                        if table_name in existing:
+                            logger.info(f"Table {table_name} already exists, skipping creation...")
+                            continue
+                
+                # Handle CREATE INDEX statements
+                elif head.startswith('CREATE INDEX'):
+                    index_match = _INDEX_RE.search(statement)
+                    if index_match and index_match.group(1) in existing_indexes:
+                        logger.info(f"Index {index_match.group(1)} already exists, skipping creation...")
+                        continue
+                
+                pending.append(statement)
+
+            except sqlite3.Error as e:
+                logger.error(f"Error checking statement: {e}")
+                logger.error(f"Statement: {statement}")
+                # Continue with other statements
+
+        if not ml_models_created:
+            logger.error("Could not find CREATE TABLE statement for ml_models in schema file.")
+
+        if pending:
+            _execute_batch(conn, pending)
+
+        conn.commit()
+
+        # Verify the ml_models table was created (diagnostics, only on request)
+        if verify:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='ml_models'")
+            if cursor.fetchone():
+                logger.info("Verification: ml_models table exists after schema update.")
+                
+                # Check columns
+                cursor.execute("PRAGMA table_info(ml_models)")
+                columns = cursor.fetchall()
+                logger.info("ml_models columns:")
+                for cid, name, ctype, notnull, default, pk in columns:
+                    logger.info(f"  {name} ({ctype})")
+            else:
+                logger.error("ml_models table was not created!")
+        
+        conn.close()
+        logger.info(f"Schema updates successfully applied to {db_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Error applying schema updates: {e}")
+        return False
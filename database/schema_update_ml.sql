@@ -77,4 +77,9 @@ CREATE TABLE feeding_patterns (
 CREATE INDEX idx_recommendations_cat ON feeding_recommendations(cat_id, recommendation_type, generated_at);
 
 -- Create index for pattern queries
-CREATE INDEX idx_patterns_cat ON feeding_patterns(cat_id, pattern_type, detected_at); 
\ No newline at end of file
+CREATE INDEX idx_patterns_cat ON feeding_patterns(cat_id, pattern_type, detected_at); 
+-- Create partial index for reading the feeding logs that have ML metrics, in time order
+CREATE INDEX idx_feeding_logs_ml ON feeding_logs(timestamp)
+WHERE meal_duration_minutes IS NOT NULL
+  AND consumption_rate_grams_per_minute IS NOT NULL
+  AND leftover_amount_grams IS NOT NULL;
@@ -33,10 +33,12 @@ class FeedingScheduleTab(QWidget):
         # Setup UI
         self.setup_ui()
         
-        # Start the scheduler timer
+        # Start the scheduler timer, aligned to wall-clock minute boundaries
         self.schedule_timer = QTimer(self)
-        self.schedule_timer.timeout.connect(self.check_feeding_schedules)
-        self.schedule_timer.start(60000)  # Check every minute
+        self.schedule_timer.setSingleShot(True)
+        self.schedule_timer.setTimerType(Qt.PreciseTimer)
+        self.schedule_timer.timeout.connect(self._on_schedule_timer)
+        self._arm_schedule_timer()
         
         # Load initial data
         self.load_food_inventory()
@@ -352,7 +354,7 @@ class FeedingScheduleTab(QWidget):
         
         try:
             # Get the most recent feeding log for this cat
-            logs = self.db_manager.get_feeding_logs(self.selected_cat_id)
+            logs = self.db_manager.get_feeding_logs(self.selected_cat_id, limit=1)
             
             if logs and len(logs) > 0:
                 last_log = logs[0]  # Most recent log
@@ -595,6 +597,20 @@ class FeedingScheduleTab(QWidget):
             logger.error(f"Error logging manual feeding: {e}")
             QMessageBox.critical(self, "Error", f"Error logging manual feeding: {str(e)}")
     
+    def _arm_schedule_timer(self):
+        """Arm the scheduler timer to fire just after the next minute boundary"""
+        # A fixed 60s interval drifts by the time spent in each check, so it can
+        # skip or double-hit a minute; re-deriving the deadline from the clock
+        # keeps one check per HH:MM.
+        now = datetime.now()
+        ms_into_minute = now.second * 1000 + now.microsecond // 1000
+        self.schedule_timer.start(60000 - ms_into_minute + 50)
+    
+    def _on_schedule_timer(self):
+        """Re-arm the scheduler timer and run the schedule check"""
+        self._arm_schedule_timer()
+        self.check_feeding_schedules()
+    
     def check_feeding_schedules(self):
         """Check if any feeding schedules need to be triggered"""
         if not self.isVisible():
@@ -613,20 +629,24 @@ class FeedingScheduleTab(QWidget):
                 schedules = self.db_manager.get_feeding_schedules(self.selected_cat_id)
                 active_schedules = [s for s in schedules if s['is_active']]
                 
-                for schedule in active_schedules:
+                due_schedules = [
+                    s for s in active_schedules
                     # Check if this schedule should run now
-                    if (current_day in schedule['days_of_week'].lower() and 
-                        schedule['time'] == current_time):
-                        
-                        # Trigger feeding
-                        cat = self.db_manager.get_cat(self.selected_cat_id)
-                        cat_name = cat['name'] if cat else "Unknown"
-                        
-                        log_id = self.db_manager.log_feeding(
-                            self.selected_cat_id, schedule['food_type'], schedule['amount'],
-                            schedule_id=schedule['id'], is_manual=False
-                        )
-                        
+                    if current_day in s['days_of_week'].lower() and s['time'] == current_time
+                ]
+                
+                if due_schedules:
+                    # Trigger all due feedings with a single commit
+                    self.db_manager.log_feedings([
+                        (self.selected_cat_id, schedule['food_type'], schedule['amount'],
+                         schedule['id'], False, None)
+                        for schedule in due_schedules
+                    ])
+                    
+                    cat = self.db_manager.get_cat(self.selected_cat_id)
+                    cat_name = cat['name'] if cat else "Unknown"
+                    
+                    for schedule in due_schedules:
                         # Show notification
                         QMessageBox.information(
                             self,
@@ -637,9 +657,9 @@ class FeedingScheduleTab(QWidget):
                         )
                         
                         logger.info(f"Automatic feeding triggered for schedule ID {schedule['id']}")
-                        
-                        # Update feeding info
-                        self.update_last_feeding_info()
+                    
+                    # Update feeding info
+                    self.update_last_feeding_info()
                 
                 # Update next feeding info
                 self.update_next_feeding_info()
@@ -65,9 +65,9 @@ class WaterDispenserTab(QWidget):
         water_level.setStyleSheet("QProgressBar { height: 20px; }")
         level_layout.addWidget(water_level)
         
-        refill_button = QPushButton("Refill")
-        refill_button.clicked.connect(self._on_refill_clicked)
-        level_layout.addWidget(refill_button)
+        self.refill_button = QPushButton("Refill")
+        self.refill_button.clicked.connect(self._on_refill_clicked)
+        level_layout.addWidget(self.refill_button)
         
         status_layout.addRow("Water Level:", level_layout)
         
@@ -126,10 +126,10 @@ class WaterDispenserTab(QWidget):
         dispense_layout.addLayout(amount_layout)
         
         # Dispense button
-        dispense_button = QPushButton("Dispense Water")
-        dispense_button.clicked.connect(self._on_dispense_clicked)
-        dispense_button.setStyleSheet("font-weight: bold; padding: 8px;")
-        dispense_layout.addWidget(dispense_button)
+        self.dispense_button = QPushButton("Dispense Water")
+        self.dispense_button.clicked.connect(self._on_dispense_clicked)
+        self.dispense_button.setStyleSheet("font-weight: bold; padding: 8px;")
+        dispense_layout.addWidget(self.dispense_button)
         
         layout.addWidget(dispense_group)
         layout.addStretch()
@@ -177,9 +177,9 @@ class WaterDispenserTab(QWidget):
         layout.addRow("", filter_group)
         
         # Apply button
-        apply_button = QPushButton("Apply Settings")
-        apply_button.clicked.connect(self._on_apply_settings_clicked)
-        layout.addRow("", apply_button)
+        self.apply_settings_button = QPushButton("Apply Settings")
+        self.apply_settings_button.clicked.connect(self._on_apply_settings_clicked)
+        layout.addRow("", self.apply_settings_button)
         
         return tab
     
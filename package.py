@@ -6,7 +6,10 @@ This script creates standalone executable versions of the AutomatiCats applicati
 for Windows, macOS, and Linux using PyInstaller.
 
 Usage:
-    python package.py [--windows] [--macos] [--linux] [--all]
+    python package.py [--windows] [--macos] [--linux] [--all] [--analyze]
+
+    --analyze lists the largest files in the built bundle and points at
+    PyInstaller's warn-AutomatiCats.txt, to help find more EXCLUDES.
 
 Requirements:
     - PyInstaller: pip install pyinstaller
@@ -17,9 +20,70 @@ import sys
 import shutil
 import subprocess
 import argparse
+import importlib.util
 import platform
+import stat
+import zipfile
 from datetime import datetime
 
+# Modules PyInstaller's import analysis reaches but the PySide6 GUI never uses
+EXCLUDES = [
+    'tkinter',
+    'test',
+    'distutils',
+    'setuptools',
+    'pip',
+    'PyQt5',
+    'PyQt6',
+    'matplotlib',
+    'IPython',
+    'numpy.tests',
+    'pandas.tests',
+    'sklearn.tests',
+]
+
+# platform.system() name -> (release label, bundle to zip with symlinks
+# preserved; None zips the whole dist directory)
+PLATFORMS = {
+    'Windows': ('Windows', None),
+    'Darwin': ('macOS', 'AutomatiCats.app'),
+    'Linux': ('Linux', 'AutomatiCats'),
+}
+
+SPEC_FILE = 'AutomatiCats.spec'
+
+# PyInstaller builds natively, so the spec picks the icon and the macOS .app
+# step from the platform it runs on; every platform shares one module list
+SPEC_TEMPLATE = """# -*- mode: python ; coding: utf-8 -*-
+# Generated by package.py from EXCLUDES; edit package.py instead of this file.
+import os
+import sys
+
+icon_ext = {{'win32': '.ico', 'darwin': '.icns'}}.get(sys.platform, '.png')
+icon = os.path.join('resources', 'icons', f'app_icon{{icon_ext}}')
+icon = icon if os.path.exists(icon) else None
+
+a = Analysis(
+    ['run.py'],
+    datas=[('resources', 'resources')],
+    excludes={excludes!r},
+)
+pyz = PYZ(a.pure)
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='AutomatiCats',
+    console=False,
+    icon=icon,
+)
+coll = COLLECT(exe, a.binaries, a.datas, name='AutomatiCats')
+
+if sys.platform == 'darwin':
+    app = BUNDLE(coll, name='AutomatiCats.app', icon=icon)
+"""
+
 def setup_argparse():
     """Configure command line arguments"""
     parser = argparse.ArgumentParser(description='Package AutomatiCats as standalone executables')
@@ -28,31 +92,50 @@ def setup_argparse():
     parser.add_argument('--linux', action='store_true', help='Build Linux executable')
     parser.add_argument('--all', action='store_true', help='Build for all platforms')
     parser.add_argument('--clean', action='store_true', help='Clean build directories before packaging')
+    parser.add_argument('--analyze', action='store_true', help='Report the largest files in the built bundle')
     return parser.parse_args()
 
 def check_requirements():
     """Check if PyInstaller is installed"""
-    try:
-        import PyInstaller
+    # A marker newer than the interpreter means an earlier build already checked
+    marker = os.path.join('build', '.pyinstaller_ok')
+    if os.path.exists(marker) and os.path.getmtime(marker) > os.path.getmtime(sys.executable):
+        return
+    
+    # find_spec locates the package without running PyInstaller's __init__
+    if importlib.util.find_spec('PyInstaller') is not None:
         print("PyInstaller is installed.")
-    except ImportError:
+    else:
         print("PyInstaller is not installed. Installing...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"])
+        subprocess.run([
+            sys.executable, "-m", "pip", "install", "pyinstaller",
+            "--quiet", "--no-cache-dir", "--disable-pip-version-check"
+        ], check=True)
         print("PyInstaller installed successfully.")
+    
+    os.makedirs('build', exist_ok=True)
+    with open(marker, 'w') as f:
+        f.write(sys.executable)
 
 def clean_directories():
     """Clean build and dist directories"""
     dirs_to_clean = ['build', 'dist']
     for directory in dirs_to_clean:
-        if os.path.exists(directory):
+        if os.path.isdir(directory):
             print(f"Cleaning {directory}...")
-            shutil.rmtree(directory)
+            with os.scandir(directory) as entries:
+                is_empty = next(entries, None) is None
+            if is_empty:
+                os.rmdir(directory)
+            else:
+                shutil.rmtree(directory)
     
     # Also remove any .spec files
-    for file in os.listdir('.'):
-        if file.endswith('.spec'):
-            os.remove(file)
-            print(f"Removed {file}")
+    with os.scandir('.') as entries:
+        for entry in entries:
+            if entry.name.endswith('.spec') and entry.is_file():
+                os.remove(entry.path)
+                print(f"Removed {entry.name}")
 
 def create_version_file():
     """Create a version.py file with build information"""
@@ -69,128 +152,108 @@ def create_version_file():
     print(f"Created version.py with version {version}")
     return version
 
-def package_windows(version):
-    """Package the application for Windows"""
-    print("Packaging for Windows...")
-    
-    # Define icon path
-    icon_path = os.path.join('resources', 'icons', 'app_icon.ico')
-    icon_param = f'--icon={icon_path}' if os.path.exists(icon_path) else ''
-    
-    # PyInstaller command
-    cmd = [
-        'pyinstaller',
-        '--name=AutomatiCats',
-        '--windowed',
-        '--onefile',
-        icon_param,
-        '--add-data=resources;resources',
-        'run.py'
-    ]
-    
-    # Remove empty parameters
-    cmd = [param for param in cmd if param]
-    
-    # Run PyInstaller
-    subprocess.run(cmd)
-    
-    # Create ZIP archive
-    output_dir = 'dist'
-    zip_name = f'AutomatiCats-{version}-Windows.zip'
-    
-    # Create release directory if it doesn't exist
-    if not os.path.exists('release'):
-        os.makedirs('release')
-    
-    shutil.make_archive(
-        os.path.join('release', zip_name.replace('.zip', '')),
-        'zip',
-        output_dir
-    )
-    
-    print(f"Windows package created: release/{zip_name}")
-
-def package_macos(version):
-    """Package the application for macOS"""
-    print("Packaging for macOS...")
-    
-    # Define icon path
-    icon_path = os.path.join('resources', 'icons', 'app_icon.icns')
-    icon_param = f'--icon={icon_path}' if os.path.exists(icon_path) else ''
-    
-    # PyInstaller command
-    cmd = [
-        'pyinstaller',
-        '--name=AutomatiCats',
-        '--windowed',
-        '--onefile',
-        icon_param,
-        '--add-data=resources:resources',
-        'run.py'
-    ]
-    
-    # Remove empty parameters
-    cmd = [param for param in cmd if param]
-    
-    # Run PyInstaller
-    subprocess.run(cmd)
-    
-    # Create ZIP archive
-    output_dir = 'dist'
-    zip_name = f'AutomatiCats-{version}-macOS.zip'
-    
-    # Create release directory if it doesn't exist
-    if not os.path.exists('release'):
-        os.makedirs('release')
-    
-    shutil.make_archive(
-        os.path.join('release', zip_name.replace('.zip', '')),
-        'zip',
-        output_dir
-    )
-    
-    print(f"macOS package created: release/{zip_name}")
-
-def package_linux(version):
-    """Package the application for Linux"""
-    print("Packaging for Linux...")
-    
-    # Define icon path
-    icon_path = os.path.join('resources', 'icons', 'app_icon.png')
-    icon_param = f'--icon={icon_path}' if os.path.exists(icon_path) else ''
-    
-    # PyInstaller command
-    cmd = [
-        'pyinstaller',
-        '--name=AutomatiCats',
-        '--windowed',
-        '--onefile',
-        icon_param,
-        '--add-data=resources:resources',
-        'run.py'
-    ]
-    
-    # Remove empty parameters
-    cmd = [param for param in cmd if param]
-    
-    # Run PyInstaller
-    subprocess.run(cmd)
+def analyze_bundle(output_dir='dist', top=25):
+    """Print the largest files in the built bundle to help pick EXCLUDES"""
+    sizes = []
+    for root, _, files in os.walk(output_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if not os.path.islink(path):
+                sizes.append((os.path.getsize(path), os.path.relpath(path, output_dir)))
+    
+    sizes.sort(reverse=True)
+    total = sum(size for size, _ in sizes)
+    print(f"\nBundle size: {total / 1e6:.1f} MB in {len(sizes)} files. Largest files:")
+    for size, path in sizes[:top]:
+        print(f"  {size / 1e6:8.2f} MB  {path}")
+    
+    for label, _ in PLATFORMS.values():
+        warn_file = os.path.join('build', label, 'AutomatiCats', 'warn-AutomatiCats.txt')
+        if os.path.exists(warn_file):
+            print(f"Review {warn_file} for modules pulled in by optional imports.")
+
+def _zip_link(archive, path, arcname):
+    """Store a symlink in the archive as a link rather than its target"""
+    info = zipfile.ZipInfo(arcname)
+    info.create_system = 3  # Unix, so external_attr carries the mode bits
+    info.external_attr = (stat.S_IFLNK | 0o777) << 16
+    archive.writestr(info, os.readlink(path))
+
+def _zip_dir(output_dir, archive_path, bundle_name=None):
+    """Zip bundle_name (or everything) in output_dir, storing symlinks as symlinks"""
+    src = os.path.join(output_dir, bundle_name) if bundle_name else output_dir
+    if not os.path.exists(src):
+        raise FileNotFoundError(f"Nothing to archive: {src} does not exist")
+    
+    archive_path = os.path.abspath(archive_path)
+    if os.path.exists(archive_path):
+        os.remove(archive_path)
+    
+    # 7-Zip compresses with all cores; -snl keeps framework symlinks as links
+    if shutil.which('7z'):
+        subprocess.run(['7z', 'a', '-tzip', '-mmt=on', '-mx=5', '-snl', '-bso0',
+                        archive_path, bundle_name or '.'], cwd=output_dir, check=True)
+        return
+    
+    # Otherwise stream the files through zipfile (shutil.make_archive would
+    # follow symlinks, which breaks and bloats framework bundles)
+    with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+        for root, dirs, files in os.walk(src):
+            for name in dirs + files:
+                path = os.path.join(root, name)
+                arcname = os.path.relpath(path, output_dir)
+                if os.path.islink(path):
+                    _zip_link(archive, path, arcname)
+                elif name in files:
+                    archive.write(path, arcname)
+
+def _ensure_spec():
+    """Write the PyInstaller spec, leaving it untouched if already up to date.
+
+    Keeping the file (and its mtime) stable lets PyInstaller reuse the cached
+    Analysis in build/ instead of recomputing the module graph on every build.
+    """
+    spec = SPEC_TEMPLATE.format(excludes=EXCLUDES)
+    if os.path.exists(SPEC_FILE):
+        with open(SPEC_FILE) as f:
+            if f.read() == spec:
+                return
+    
+    with open(SPEC_FILE, 'w') as f:
+        f.write(spec)
+    print(f"Wrote {SPEC_FILE}")
+
+def _package(version, plat):
+    """Package the application for one platform (a key of PLATFORMS)"""
+    label, bundle_name = PLATFORMS[plat]
+    print(f"Packaging for {label}...")
+    
+    # Run PyInstaller from the shared spec, with per-platform output so that
+    # builds for different platforms don't clobber each other
+    _ensure_spec()
+    output_dir = os.path.join('dist', label)
+    result = subprocess.run([
+        sys.executable, '-m', 'PyInstaller', '--noconfirm',
+        '--distpath', output_dir,
+        '--workpath', os.path.join('build', label),
+        SPEC_FILE
+    ], check=False)
+    if result.returncode != 0:
+        print(f"PyInstaller failed for {label}; skipping archive")
+        return False
     
     # Create ZIP archive
-    output_dir = 'dist'
-    zip_name = f'AutomatiCats-{version}-Linux.zip'
-    
-    # Create release directory if it doesn't exist
-    if not os.path.exists('release'):
-        os.makedirs('release')
+    zip_name = f'AutomatiCats-{version}-{label}.zip'
+    os.makedirs('release', exist_ok=True)
     
-    shutil.make_archive(
-        os.path.join('release', zip_name.replace('.zip', '')),
-        'zip',
-        output_dir
-    )
+    try:
+        _zip_dir(output_dir, os.path.join('release', zip_name), bundle_name)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"Archiving failed for {label}: {e}")
+        return False
     
-    print(f"Linux package created: release/{zip_name}")
+    print(f"{label} package created: release/{zip_name}")
+    return True
 
 def main():
     """Main function"""
@@ -209,27 +272,29 @@ def main():
     # Create version file
     version = create_version_file()
     
-    # Package for selected platforms
-    if args.windows or args.all:
-        package_windows(version)
-    
-    if args.macos or args.all:
-        package_macos(version)
-    
-    if args.linux or args.all:
-        package_linux(version)
-    
-    # If no platform specified, package for current platform
-    if not (args.windows or args.macos or args.linux or args.all):
-        current_os = platform.system()
-        if current_os == 'Windows':
-            package_windows(version)
-        elif current_os == 'Darwin':
-            package_macos(version)
-        elif current_os == 'Linux':
-            package_linux(version)
-        else:
-            print(f"Unsupported platform: {current_os}")
+    # PyInstaller cannot cross-compile, so only the host platform can be built
+    current_os = platform.system()
+    requested = [plat for plat, flag in (('Windows', args.windows),
+                                          ('Darwin', args.macos),
+                                          ('Linux', args.linux)) if flag or args.all]
+    for plat in requested:
+        if plat != current_os:
+            print(f"Skipping {PLATFORMS[plat][0]}: PyInstaller can only build it on {PLATFORMS[plat][0]}")
+    if current_os not in PLATFORMS:
+        print(f"Unsupported platform: {current_os}")
+        sys.exit(1)
+    if requested and current_os not in requested:
+        print("\nNothing to package on this platform")
+        sys.exit(1)
+    
+    ok = _package(version, current_os)
+    
+    if args.analyze:
+        analyze_bundle()
+    
+    if not ok:
+        print(f"\nPackaging failed for {PLATFORMS[current_os][0]}")
+        sys.exit(1)
     
     print("\nPackaging completed successfully!")
     print(f"Executable packages are available in the 'release' directory.")
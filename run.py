@@ -7,17 +7,20 @@ This script launches the AutomatiCats application.
 
 import sys
 import os
-import platform
-import subprocess
 import importlib.util
-import traceback
+
+# Qt binding found by check_dependencies, cached on disk for later launches
+_QT_BINDING = None
+QT_BINDING_CACHE = os.path.join('data', '.qt_binding')
 
 def setup_environment():
     """Set up the environment for the application"""
-    # Create necessary directories
-    os.makedirs('data', exist_ok=True)
-    os.makedirs('data/photos', exist_ok=True)
-    os.makedirs('logs', exist_ok=True)
+    import platform
+    
+    # Create necessary directories (usually present, so check before makedirs)
+    for directory in ('data', 'data/photos', 'logs'):
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
     
     # Set platform-specific configurations
     if platform.system() == 'Windows':
@@ -30,16 +33,51 @@ def setup_environment():
         # Linux/Unix-specific setup
         pass
 
+def _remember_qt_binding(binding):
+    """Record the detected Qt binding for this process and later launches"""
+    global _QT_BINDING
+    _QT_BINDING = binding
+    try:
+        with open(QT_BINDING_CACHE, 'w') as f:
+            f.write(binding)
+    except OSError:
+        pass
+
+def _forget_qt_binding():
+    """Drop the cached Qt binding, e.g. after it failed to import"""
+    global _QT_BINDING
+    _QT_BINDING = None
+    try:
+        os.remove(QT_BINDING_CACHE)
+    except OSError:
+        pass
+
 def check_dependencies():
     """Check if necessary dependencies are installed"""
+    global _QT_BINDING
+    if _QT_BINDING is not None:
+        return True
+    
+    # A previous launch already found a binding; skip the find_spec lookups
+    try:
+        with open(QT_BINDING_CACHE) as f:
+            cached = f.read().strip()
+        if cached in ('PySide6', 'PyQt6'):
+            _QT_BINDING = cached
+            return True
+    except OSError:
+        pass
+    
     # First try importing PySide6 (our preferred alternative)
     if importlib.util.find_spec("PySide6") is not None:
         print("PySide6 is installed. Will use it instead of PyQt6.")
+        _remember_qt_binding('PySide6')
         return True
         
     # Then check for PyQt6
     if importlib.util.find_spec("PyQt6") is not None:
         print("PyQt6 is installed.")
+        _remember_qt_binding('PyQt6')
         return True
     
     # If neither is installed, ask to install PySide6
@@ -47,6 +85,7 @@ def check_dependencies():
     print("Would you like to install PySide6? (recommended) (y/n)")
     choice = input().strip().lower()
     if choice == 'y':
+        import subprocess
         try:
             print("Installing PySide6...")
             subprocess.check_call([
@@ -54,6 +93,7 @@ def check_dependencies():
                 "--no-cache-dir", "--disable-pip-version-check"
             ])
             print("PySide6 installed successfully!")
+            _remember_qt_binding('PySide6')
             return True
         except subprocess.CalledProcessError as e:
             print(f"Error installing PySide6: {e}")
@@ -67,8 +107,30 @@ def check_dependencies():
         print("  pip install PyQt6")
         return False
 
+def handle_info_flags(argv):
+    """Answer --help/--version without importing Qt; return True if handled"""
+    if '-h' in argv or '--help' in argv:
+        print("Usage: python run.py [--help] [--version]")
+        print("Launches the AutomatiCats desktop application.")
+        return True
+    
+    if '--version' in argv:
+        # version.py is generated by package.py; source checkouts may not have it
+        try:
+            from version import VERSION
+        except ImportError:
+            VERSION = "development"
+        print(f"AutomatiCats {VERSION}")
+        return True
+    
+    return False
+
 def main():
     """Main function to launch the application"""
+    # Informational flags exit before the environment setup and Qt import
+    if handle_info_flags(sys.argv[1:]):
+        return 0
+    
     print("Starting AutomatiCats...")
     
     try:
@@ -91,10 +153,13 @@ def main():
             return run_app()
             
         except ImportError as e:
+            # The cached binding may be stale (e.g. uninstalled); re-detect next time
+            _forget_qt_binding()
             print(f"Error importing application: {e}")
             print(f"Current directory: {os.getcwd()}")
             print(f"Python path: {sys.path}")
             print("\nTraceback:")
+            import traceback
             traceback.print_exc()
             
             print("\nPlease check that all files are in the correct location.")
@@ -103,6 +168,7 @@ def main():
         except Exception as e:
             print(f"Error running application: {e}")
             print("\nTraceback:")
+            import traceback
             traceback.print_exc()
             return 1
             
@@ -112,6 +178,7 @@ def main():
         
     except Exception as e:
         print(f"Unexpected error: {e}")
+        import traceback
         traceback.print_exc()
         return 1
 
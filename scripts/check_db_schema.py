@@ -4,15 +4,17 @@ Check the database schema for AutomatiCats
 """
 
 import os
-import sqlite3
 import sys
 
+# Add the parent directory to sys.path to import project modules
+script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.dirname(script_dir)
+sys.path.insert(0, project_root)
+
+from core.db_manager import connect
+
 def check_schema():
     """Check the schema of the database tables"""
-    # Get the project root directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(script_dir)
-    
     # Path to the database
     db_path = os.path.join(project_root, 'data', 'automaticats.db')
     
@@ -23,8 +25,7 @@ def check_schema():
     
     try:
         # Connect to the database
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = connect(db_path, read_only=True)
         cursor = conn.cursor()
         
         # Get all tables
@@ -32,8 +33,7 @@ def check_schema():
         tables = cursor.fetchall()
         
         print(f"Found {len(tables)} tables in the database:")
-        for table in tables:
-            table_name = table['name']
+        for (table_name,) in tables:
             print(f"\n===== TABLE: {table_name} =====")
             
             # Get the table schema
@@ -41,8 +41,8 @@ def check_schema():
             columns = cursor.fetchall()
             
             print("Columns:")
-            for col in columns:
-                print(f"  {col['name']} ({col['type']}){' PRIMARY KEY' if col['pk'] else ''}")
+            for cid, name, ctype, notnull, default, pk in columns:
+                print(f"  {name} ({ctype}){' PRIMARY KEY' if pk else ''}")
         
         # Close the connection
         conn.close()
@@ -9,9 +9,9 @@ for feeding pattern recognition and smart recommendations.
 import os
 import sys
 import argparse
+import json
 import logging
 import sqlite3
-import random
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
@@ -21,7 +21,13 @@ script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 sys.path.insert(0, project_root)
 
-from core.db_manager import DatabaseManager
+from core.db_manager import DatabaseManager, tune_connection
+
+# orjson is optional; it serializes the pattern dicts several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +36,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger('ml_data_collection')
 
+# Feeding time periods, in the order used for distributions and tie-breaks
+TIME_PERIODS = (
+    'Morning (5am-12pm)',
+    'Afternoon (12pm-5pm)',
+    'Evening (5pm-10pm)',
+    'Night (10pm-5am)'
+)
+
+# Statements reused across batches; one string object each, so the
+# connection's statement cache hits instead of re-preparing them
+INSERT_LOG_SQL = '''
+    INSERT INTO feeding_logs (cat_id, food_type, amount, timestamp, is_manual)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+UPDATE_METRICS_SQL = '''
+    UPDATE feeding_logs
+    SET meal_duration_minutes = ?,
+        consumption_rate_grams_per_minute = ?,
+        leftover_amount_grams = ?
+    WHERE id = ?
+'''
+
+INSERT_PATTERN_SQL = '''
+    INSERT INTO feeding_patterns (
+        cat_id, pattern_type, pattern_data, confidence_score
+    ) VALUES (?, ?, ?, ?)
+'''
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Collect ML training data from feeding logs')
@@ -37,38 +72,51 @@ def parse_arguments():
     parser.add_argument('--debug', action='store_true', help='Enable debug mode with random data generation')
     return parser.parse_args()
 
-def collect_feeding_logs(db_manager, days=30, debug=False):
-    """Collect feeding logs from the database for the specified number of days."""
+def collect_feeding_logs(db_manager, days=30, debug=False, chunksize=50000):
+    """Yield feeding logs for the specified number of days as DataFrame chunks.
+    
+    Logs are paged by id, so at most chunksize rows are held at a time and each
+    page's query has finished before the caller writes metrics back.
+    """
     try:
         start_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d 00:00:00')
         
-        cursor = db_manager.conn.cursor()
         query = '''
             SELECT fl.*, c.name as cat_name
             FROM feeding_logs fl
             JOIN cats c ON fl.cat_id = c.id
-            WHERE fl.timestamp >= ?
-            ORDER BY fl.timestamp
+            WHERE fl.timestamp >= ? AND fl.id > ?
+            ORDER BY fl.id
+            LIMIT ?
         '''
-        cursor.execute(query, (start_date,))
-        logs = cursor.fetchall()
-        
-        logger.info(f"Retrieved {len(logs)} feeding logs for the past {days} days")
-        
-        if not logs and debug:
+        total = 0
+        last_id = 0
+        while True:
+            chunk = pd.read_sql_query(query, db_manager.conn, params=(start_date, last_id, chunksize))
+            if chunk.empty:
+                break
+            total += len(chunk)
+            last_id = int(chunk['id'].iloc[-1])
+            yield chunk
+            if len(chunk) < chunksize:
+                break
+        
+        logger.info(f"Retrieved {total} feeding logs for the past {days} days")
+        
+        if not total and debug:
             # Generate sample data in debug mode
             logger.info("Generating sample feeding logs for debug mode")
             sample_logs = generate_sample_logs(db_manager, days)
-            return sample_logs
-        
-        return logs
+            if not sample_logs.empty:
+                yield sample_logs
     except Exception as e:
         logger.error(f"Error collecting feeding logs: {e}")
-        return []
 
 def generate_sample_logs(db_manager, days=30):
     """Generate sample feeding logs for debug mode."""
     try:
+        rng = np.random.default_rng()
+        
         # Get cats from database or create sample cats if none exist
         cursor = db_manager.conn.cursor()
         cursor.execute('SELECT * FROM cats')
@@ -76,140 +124,130 @@ def generate_sample_logs(db_manager, days=30):
         
         if not cats:
             # Add sample cats if none exist
-            cat_ids = []
+            cat_names = {}
             for name in ['Whiskers', 'Mittens', 'Luna']:
                 cursor.execute('''
                     INSERT INTO cats (name, age, weight)
                     VALUES (?, ?, ?)
-                ''', (name, random.uniform(1, 15), random.uniform(2.5, 6.5)))
-                cat_ids.append(cursor.lastrowid)
+                ''', (name, rng.uniform(1, 15), rng.uniform(2.5, 6.5)))
+                cat_names[cursor.lastrowid] = name
             db_manager.conn.commit()
         else:
-            cat_ids = [cat['id'] for cat in cats]
-        
-        # Generate sample logs
-        sample_logs = []
-        food_types = ['Dry', 'Wet', 'Treats']
-        now = datetime.now()
-        
-        for day in range(days):
-            for cat_id in cat_ids:
-                # 2-3 feedings per day
-                for _ in range(random.randint(2, 3)):
-                    timestamp = now - timedelta(days=day, 
-                                               hours=random.randint(0, 23),
-                                               minutes=random.randint(0, 59))
-                    food_type = random.choice(food_types)
-                    amount = random.uniform(20, 100) if food_type == 'Dry' else random.uniform(50, 150)
-                    
-                    # Insert the log
-                    cursor.execute('''
-                        INSERT INTO feeding_logs (cat_id, food_type, amount, timestamp, is_manual)
-                        VALUES (?, ?, ?, ?, ?)
-                    ''', (cat_id, food_type, amount, timestamp, random.choice([0, 1])))
-                    
-                    # Create a sample log dict for immediate use
-                    log = {
-                        'id': cursor.lastrowid,
-                        'cat_id': cat_id,
-                        'food_type': food_type,
-                        'amount': amount,
-                        'timestamp': timestamp,
-                        'is_manual': random.choice([0, 1])
-                    }
-                    sample_logs.append(log)
+            cat_names = {cat['id']: cat['name'] for cat in cats}
+        
+        # Generate sample logs for the whole days x cats grid at once
+        food_types = np.array(['Dry', 'Wet', 'Treats'])
+        cat_ids = np.array(list(cat_names))
+        now = np.datetime64(datetime.now(), 's')
+        
+        # 2-3 feedings per cat per day
+        feedings = rng.integers(2, 4, size=days * len(cat_ids))
+        day_offsets = np.repeat(np.repeat(np.arange(days), len(cat_ids)), feedings)
+        log_cat_ids = np.repeat(np.tile(cat_ids, days), feedings)
+        total = len(log_cat_ids)
+        
+        # Random hour and minute within each day, as plain 'YYYY-MM-DD HH:MM:SS' strings
+        offsets = day_offsets * 86400 + rng.integers(0, 24, total) * 3600 + rng.integers(0, 60, total) * 60
+        timestamps = np.char.replace(
+            np.datetime_as_string(now - offsets.astype('timedelta64[s]'), unit='s'), 'T', ' '
+        )
+        
+        log_food_types = rng.choice(food_types, total)
+        amounts = np.where(log_food_types == 'Dry', rng.uniform(20, 100, total), rng.uniform(50, 150, total))
+        is_manual = rng.integers(0, 2, total)
+        
+        # Insert in timestamp order, so rowids follow time and the B-tree is
+        # appended to instead of split (the strings sort chronologically)
+        order = np.argsort(timestamps, kind='stable')
+        log_cat_ids, timestamps = log_cat_ids[order], timestamps[order]
+        log_food_types, amounts, is_manual = log_food_types[order], amounts[order], is_manual[order]
+        
+        # tolist() converts to native Python values that sqlite3 can bind
+        rows = list(zip(
+            log_cat_ids.tolist(),
+            log_food_types.tolist(),
+            amounts.tolist(),
+            timestamps.tolist(),
+            is_manual.tolist()
+        ))
         
-        db_manager.conn.commit()
-        logger.info(f"Generated {len(sample_logs)} sample feeding logs")
+        # Insert all logs in one batch
+        cursor.executemany(INSERT_LOG_SQL, rows)
         
-        # Retrieve the actual logs from the database
-        cursor.execute('''
-            SELECT fl.*, c.name as cat_name
-            FROM feeding_logs fl
-            JOIN cats c ON fl.cat_id = c.id
-            ORDER BY fl.timestamp
-        ''')
-        return cursor.fetchall()
+        # Rows inserted in one transaction get consecutive ids ending at MAX(id)
+        cursor.execute('SELECT MAX(id) FROM feeding_logs')
+        first_id = cursor.fetchone()[0] - len(rows) + 1
+        db_manager.conn.commit()
+        logger.info(f"Generated {len(rows)} sample feeding logs")
+        
+        # Build the DataFrame straight from the generated columns, joining the
+        # cat names in memory instead of re-reading the logs
+        return pd.DataFrame({
+            'id': np.arange(first_id, first_id + total),
+            'cat_id': log_cat_ids,
+            'food_type': log_food_types,
+            'amount': amounts,
+            'timestamp': timestamps,
+            'is_manual': is_manual,
+            'cat_name': pd.Series(log_cat_ids).map(cat_names).to_numpy()
+        })
     
     except Exception as e:
         logger.error(f"Error generating sample logs: {e}")
-        return []
+        return pd.DataFrame()
 
-def generate_ml_metrics(feeding_logs):
-    """Generate ML metrics from feeding logs."""
-    if not feeding_logs:
+def generate_ml_metrics(df):
+    """Generate ML metrics from a DataFrame of feeding logs."""
+    if df is None or df.empty:
         logger.warning("No feeding logs to generate metrics from")
-        return []
-    
-    logger.info(f"Generating ML metrics from {len(feeding_logs)} feeding logs")
+        return pd.DataFrame()
     
-    # Convert logs to DataFrame for easier analysis
-    df = pd.DataFrame([dict(row) for row in feeding_logs])
+    logger.info(f"Generating ML metrics from {len(df)} feeding logs")
     
     # Ensure timestamp is datetime
     if 'timestamp' in df.columns:
         df['timestamp'] = pd.to_datetime(df['timestamp'])
     
-    # Add additional ML metrics
-    metrics = []
+    # Compute the metrics column-wise for all logs at once
+    rng = np.random.default_rng()
+    n = len(df)
+    amounts = df['amount'].to_numpy(dtype=float)
     
-    for _, log in df.iterrows():
-        # Calculate meal duration (random for now, would be actual duration in real system)
-        meal_duration = random.uniform(2, 15)  # minutes
-        
-        # Calculate consumption rate
-        consumption_rate = log['amount'] / meal_duration if meal_duration > 0 else 0
-        
-        # Calculate leftover food (random for demonstration)
-        leftover = random.uniform(0, log['amount'] * 0.3)
-        
-        # Create metrics dict
-        metric = {
-            'log_id': log['id'],
-            'cat_id': log['cat_id'],
-            'meal_duration': meal_duration,
-            'consumption_rate': consumption_rate,
-            'leftover_food': leftover,
-            'time_of_day': log['timestamp'].hour
-        }
-        metrics.append(metric)
+    # Meal duration is random for now; would be the actual duration in a real system
+    meal_duration = rng.uniform(2, 15, n)  # minutes
+    
+    metrics = pd.DataFrame({
+        'log_id': df['id'].to_numpy(),
+        'cat_id': df['cat_id'].to_numpy(),
+        'meal_duration': meal_duration,
+        'consumption_rate': amounts / meal_duration,
+        # Leftover food is random for demonstration
+        'leftover_food': rng.uniform(0, amounts * 0.3),
+        'time_of_day': df['timestamp'].dt.hour.to_numpy()
+    })
     
     logger.info(f"Generated {len(metrics)} ML metrics")
     return metrics
 
 def update_feeding_logs(db_manager, metrics):
-    """Update feeding logs with ML metrics."""
-    if not metrics:
+    """Update feeding logs with the ML metrics DataFrame from generate_ml_metrics."""
+    if metrics is None or metrics.empty:
         logger.warning("No metrics to update")
         return
     
     try:
-        cursor = db_manager.conn.cursor()
-        
-        # Check if ML metrics columns exist, add them if not
-        cursor.execute("PRAGMA table_info(feeding_logs)")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        column_mapping = {
-            'meal_duration': 'meal_duration_minutes',
-            'consumption_rate': 'consumption_rate_grams_per_minute',
-            'leftover_food': 'leftover_amount_grams'
-        }
+        # tolist() yields native Python numbers, which sqlite3 can bind
+        params = list(zip(
+            metrics['meal_duration'].tolist(),
+            metrics['consumption_rate'].tolist(),
+            metrics['leftover_food'].tolist(),
+            metrics['log_id'].tolist()
+        ))
         
-        # Update logs with metrics
-        for metric in metrics:
-            cursor.execute('''
-                UPDATE feeding_logs
-                SET meal_duration_minutes = ?,
-                    consumption_rate_grams_per_minute = ?,
-                    leftover_amount_grams = ?
-                WHERE id = ?
-            ''', (
-                metric['meal_duration'],
-                metric['consumption_rate'],
-                metric['leftover_food'],
-                metric['log_id']
-            ))
+        # Update all logs in one explicit write transaction
+        if not db_manager.conn.in_transaction:
+            db_manager.conn.execute("BEGIN IMMEDIATE")
+        db_manager.conn.executemany(UPDATE_METRICS_SQL, params)
         
         db_manager.conn.commit()
         logger.info(f"Updated {len(metrics)} feeding logs with ML metrics")
@@ -217,126 +255,104 @@ def update_feeding_logs(db_manager, metrics):
         logger.error(f"Error updating feeding logs with metrics: {e}")
         db_manager.conn.rollback()
 
-def analyze_time_preference(db_manager, cat_id):
-    """Analyze feeding time preference for a cat."""
-    try:
-        cursor = db_manager.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                strftime('%H', timestamp) as hour,
-                COUNT(*) as frequency
+def load_feeding_aggregates(db_manager):
+    """Aggregate feeding_logs for every cat at once.
+    
+    Returns (period_table, food_table): feeding counts per period with one row
+    per cat_id, and per-food-type averages indexed by cat_id. Both come from a
+    single grouped query each, instead of three queries per cat.
+    """
+    # Bucket the feeding hours into periods inside SQLite
+    period_df = pd.read_sql_query('''
+        SELECT 
+            cat_id,
+            CASE
+                WHEN hour BETWEEN 5 AND 11 THEN 'Morning (5am-12pm)'
+                WHEN hour BETWEEN 12 AND 16 THEN 'Afternoon (12pm-5pm)'
+                WHEN hour BETWEEN 17 AND 21 THEN 'Evening (5pm-10pm)'
+                ELSE 'Night (10pm-5am)'
+            END as period,
+            COUNT(*) as frequency
+        FROM (
+            SELECT cat_id, CAST(strftime('%H', timestamp) AS INTEGER) as hour
             FROM feeding_logs
-            WHERE cat_id = ?
-            GROUP BY hour
-            ORDER BY frequency DESC
-        ''', (cat_id,))
-        results = cursor.fetchall()
-        
-        # Get the preferred time periods
-        morning_count = 0
-        afternoon_count = 0
-        evening_count = 0
-        night_count = 0
-        
-        for result in results:
-            hour = int(result['hour'])
-            freq = result['frequency']
-            
-            if 5 <= hour < 12:
-                morning_count += freq
-            elif 12 <= hour < 17:
-                afternoon_count += freq
-            elif 17 <= hour < 22:
-                evening_count += freq
-            else:
-                night_count += freq
-        
+        )
+        GROUP BY cat_id, period
+    ''', db_manager.conn)
+    period_table = period_df.set_index(['cat_id', 'period'])['frequency'].unstack(fill_value=0)
+    
+    # Food preference and consumption share one per-food-type aggregate
+    food_table = pd.read_sql_query('''
+        SELECT 
+            cat_id,
+            food_type,
+            COUNT(*) as frequency,
+            AVG(amount) as avg_amount,
+            AVG(COALESCE(leftover_amount_grams, 0)) as avg_leftover,
+            AVG(COALESCE(meal_duration_minutes, 0)) as avg_duration,
+            AVG(COALESCE(consumption_rate_grams_per_minute, 0)) as avg_rate
+        FROM feeding_logs
+        GROUP BY cat_id, food_type
+        ORDER BY cat_id, food_type
+    ''', db_manager.conn).set_index('cat_id')
+    
+    return period_table, food_table
+
+def analyze_time_preference(period_counts):
+    """Analyze feeding time preference from a cat's {period: count} dict."""
+    try:
         # Determine preferred time
-        periods = {
-            'Morning (5am-12pm)': morning_count,
-            'Afternoon (12pm-5pm)': afternoon_count,
-            'Evening (5pm-10pm)': evening_count,
-            'Night (10pm-5am)': night_count
-        }
-        
-        preferred_time = max(periods, key=periods.get)
-        confidence = periods[preferred_time] / sum(periods.values()) if sum(periods.values()) > 0 else 0
+        counts = np.array([period_counts.get(period, 0) for period in TIME_PERIODS])
+        best = int(counts.argmax())
+        total = counts.sum()
         
         return {
-            'preferred_time': preferred_time,
-            'confidence': confidence,
-            'time_distribution': periods
+            'preferred_time': TIME_PERIODS[best],
+            'confidence': float(counts[best] / total) if total > 0 else 0,
+            'time_distribution': dict(zip(TIME_PERIODS, counts.tolist()))
         }
     except Exception as e:
         logger.error(f"Error analyzing time preference: {e}")
         return None
 
-def analyze_food_preference(db_manager, cat_id):
-    """Analyze food type preference for a cat."""
+def analyze_food_preference(food_stats):
+    """Analyze food type preference from a cat's per-food-type rows."""
     try:
-        cursor = db_manager.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                food_type,
-                COUNT(*) as frequency,
-                AVG(amount) as avg_amount,
-                AVG(COALESCE(leftover_amount_grams, 0)) as avg_leftover
-            FROM feeding_logs
-            WHERE cat_id = ?
-            GROUP BY food_type
-            ORDER BY frequency DESC
-        ''', (cat_id,))
-        results = cursor.fetchall()
-        
-        if not results:
+        if not food_stats:
             return None
         
+        food_types = [result['food_type'] for result in food_stats]
+        frequency = np.array([result['frequency'] for result in food_stats], dtype=float)
+        avg_amount = np.array([result['avg_amount'] for result in food_stats], dtype=float)
+        avg_leftover = np.array([result['avg_leftover'] for result in food_stats], dtype=float)
+        
         # Calculate preference based on frequency and leftover
-        preferences = {}
-        for result in results:
-            food_type = result['food_type']
-            frequency = result['frequency']
-            avg_leftover_ratio = result['avg_leftover'] / result['avg_amount'] if result['avg_amount'] > 0 else 0
-            
-            # Higher score = more preferred (more frequency, less leftover)
-            preference_score = frequency * (1 - avg_leftover_ratio)
-            preferences[food_type] = preference_score
+        # Higher score = more preferred (more frequency, less leftover)
+        avg_leftover_ratio = np.divide(avg_leftover, avg_amount,
+                                       out=np.zeros_like(avg_leftover), where=avg_amount > 0)
+        scores = frequency * (1 - avg_leftover_ratio)
         
         # Get preferred food type
-        preferred_food = max(preferences, key=preferences.get)
-        total_score = sum(preferences.values())
-        confidence = preferences[preferred_food] / total_score if total_score > 0 else 0
+        best = int(scores.argmax())
+        total_score = scores.sum()
         
         return {
-            'preferred_food': preferred_food,
-            'confidence': confidence,
-            'food_distribution': preferences
+            'preferred_food': food_types[best],
+            'confidence': float(scores[best] / total_score) if total_score > 0 else 0,
+            'food_distribution': dict(zip(food_types, scores.tolist()))
         }
     except Exception as e:
         logger.error(f"Error analyzing food preference: {e}")
         return None
 
-def analyze_consumption_pattern(db_manager, cat_id):
-    """Analyze consumption patterns for a cat."""
+def analyze_consumption_pattern(food_stats):
+    """Analyze consumption patterns from a cat's per-food-type rows."""
     try:
-        cursor = db_manager.conn.cursor()
-        cursor.execute('''
-            SELECT 
-                AVG(amount) as avg_amount,
-                AVG(COALESCE(meal_duration_minutes, 0)) as avg_duration,
-                AVG(COALESCE(consumption_rate_grams_per_minute, 0)) as avg_rate,
-                food_type
-            FROM feeding_logs
-            WHERE cat_id = ?
-            GROUP BY food_type
-        ''', (cat_id,))
-        results = cursor.fetchall()
-        
-        if not results:
+        if not food_stats:
             return None
         
         consumption_patterns = {}
-        for result in results:
+        for result in food_stats:
             food_type = result['food_type']
             consumption_patterns[food_type] = {
                 'avg_amount': result['avg_amount'],
@@ -363,17 +379,30 @@ def analyze_patterns(db_manager):
             logger.warning("No cats found in database")
             return
         
+        # Two grouped scans cover every cat
+        period_table, food_table = load_feeding_aggregates(db_manager)
+        
         patterns = []
+        pattern_rows_all = []
         for cat in cats:
             cat_id = cat['id']
             cat_name = cat['name']
             
             logger.info(f"Analyzing patterns for cat: {cat_name}")
             
+            # Slice this cat's aggregates (as native Python values for JSON)
+            period_counts = {}
+            if cat_id in period_table.index:
+                row = period_table.loc[cat_id]
+                period_counts = dict(zip(row.index.tolist(), row.tolist()))
+            food_stats = []
+            if cat_id in food_table.index:
+                food_stats = food_table.loc[[cat_id]].to_dict('records')
+            
             # Analyze different aspects of feeding behavior
-            time_pref = analyze_time_preference(db_manager, cat_id)
-            food_pref = analyze_food_preference(db_manager, cat_id)
-            consumption = analyze_consumption_pattern(db_manager, cat_id)
+            time_pref = analyze_time_preference(period_counts)
+            food_pref = analyze_food_preference(food_stats)
+            consumption = analyze_consumption_pattern(food_stats)
             
             # Skip if no meaningful data
             if not time_pref or not food_pref or not consumption:
@@ -398,79 +427,68 @@ def analyze_patterns(db_manager):
             }
             
             patterns.append(pattern)
-            
-            # Save the pattern
-            save_pattern(db_manager, pattern)
+            pattern_rows_all.extend(pattern_rows(pattern))
+        
+        # Save the patterns for every cat at once
+        save_patterns(db_manager, pattern_rows_all)
         
         logger.info(f"Analyzed patterns for {len(patterns)} cats")
     except Exception as e:
         logger.error(f"Error analyzing patterns: {e}")
 
-def save_pattern(db_manager, pattern):
-    """Save the analyzed pattern to the database."""
+def dumps_compact(data):
+    """Serialize data to a compact JSON string, with orjson when available."""
+    if orjson is not None:
+        # Decoded back to str so pattern_data stays TEXT rather than BLOB
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(data, separators=(',', ':'))
+
+def pattern_rows(pattern):
+    """Build the feeding_patterns rows (time, food, consumption) for an analyzed pattern."""
+    # Time preference pattern
+    time_pattern_data = {
+        'preferred_time': pattern['time_preference'],
+        'confidence': pattern['time_confidence'],
+        'distribution': pattern['pattern_data']['time']['time_distribution']
+    }
+    
+    # Food preference pattern
+    food_pattern_data = {
+        'preferred_food': pattern['food_preference'],
+        'confidence': pattern['food_confidence'],
+        'distribution': pattern['pattern_data']['food']['food_distribution']
+    }
+    
+    # Consumption pattern
+    consumption_pattern_data = {
+        'avg_consumption_rate': pattern['avg_consumption_rate'],
+        'patterns': pattern['pattern_data']['consumption']['consumption_patterns']
+    }
+    
+    return [
+        (pattern['cat_id'], 'time_preference',
+         dumps_compact(time_pattern_data), pattern['time_confidence']),
+        (pattern['cat_id'], 'food_preference',
+         dumps_compact(food_pattern_data), pattern['food_confidence']),
+        (pattern['cat_id'], 'consumption_pattern',
+         dumps_compact(consumption_pattern_data),
+         0.75)  # Default confidence for consumption patterns
+    ]
+
+def save_patterns(db_manager, rows):
+    """Save feeding_patterns rows for all cats in one transaction."""
+    if not rows:
+        return
+    
     try:
-        cursor = db_manager.conn.cursor()
-        
-        # Convert pattern_data to JSON
-        import json
-        
-        # Save time preference pattern
-        time_pattern_data = {
-            'preferred_time': pattern['time_preference'],
-            'confidence': pattern['time_confidence'],
-            'distribution': pattern['pattern_data']['time']['time_distribution']
-        }
-        
-        cursor.execute('''
-            INSERT INTO feeding_patterns (
-                cat_id, pattern_type, pattern_data, confidence_score
-            ) VALUES (?, ?, ?, ?)
-        ''', (
-            pattern['cat_id'],
-            'time_preference',
-            json.dumps(time_pattern_data),
-            pattern['time_confidence']
-        ))
-        
-        # Save food preference pattern
-        food_pattern_data = {
-            'preferred_food': pattern['food_preference'],
-            'confidence': pattern['food_confidence'],
-            'distribution': pattern['pattern_data']['food']['food_distribution']
-        }
-        
-        cursor.execute('''
-            INSERT INTO feeding_patterns (
-                cat_id, pattern_type, pattern_data, confidence_score
-            ) VALUES (?, ?, ?, ?)
-        ''', (
-            pattern['cat_id'],
-            'food_preference',
-            json.dumps(food_pattern_data),
-            pattern['food_confidence']
-        ))
-        
-        # Save consumption pattern
-        consumption_pattern_data = {
-            'avg_consumption_rate': pattern['avg_consumption_rate'],
-            'patterns': pattern['pattern_data']['consumption']['consumption_patterns']
-        }
-        
-        cursor.execute('''
-            INSERT INTO feeding_patterns (
-                cat_id, pattern_type, pattern_data, confidence_score
-            ) VALUES (?, ?, ?, ?)
-        ''', (
-            pattern['cat_id'],
-            'consumption_pattern',
-            json.dumps(consumption_pattern_data),
-            0.75  # Default confidence for consumption patterns
-        ))
+        if not db_manager.conn.in_transaction:
+            db_manager.conn.execute("BEGIN IMMEDIATE")
+        db_manager.conn.executemany(INSERT_PATTERN_SQL, rows)
         
         db_manager.conn.commit()
-        logger.info(f"Saved feeding patterns for cat ID {pattern['cat_id']}")
+        logger.info(f"Saved {len(rows)} feeding patterns")
     except Exception as e:
-        logger.error(f"Error saving pattern: {e}")
+        logger.error(f"Error saving patterns: {e}")
         db_manager.conn.rollback()
 
 def main():
@@ -483,25 +501,27 @@ def main():
     if args.debug:
         logger.info("Debug mode enabled - will generate random metrics")
     
-    # Initialize database manager
+    # Initialize database manager; this script is write-heavy, so use WAL
     db_manager = DatabaseManager()
+    tune_connection(db_manager.conn, cache_kib=65536)
     
     try:
         # Collect feeding logs
         logger.info(f"Collecting feeding logs for the past {args.days} days")
-        feeding_logs = collect_feeding_logs(db_manager, args.days, args.debug)
+        processed = 0
+        for feeding_logs in collect_feeding_logs(db_manager, args.days, args.debug):
+            # Generate ML metrics
+            metrics = generate_ml_metrics(feeding_logs)
+            
+            # Update feeding logs with metrics
+            update_feeding_logs(db_manager, metrics)
+            processed += len(feeding_logs)
         
-        if not feeding_logs:
+        if not processed:
             logger.warning("No feeding logs found, exiting")
             db_manager.close()
             return
         
-        # Generate ML metrics
-        metrics = generate_ml_metrics(feeding_logs)
-        
-        # Update feeding logs with metrics
-        update_feeding_logs(db_manager, metrics)
-        
         # Analyze feeding patterns
         analyze_patterns(db_manager)
         
@@ -8,9 +8,9 @@ to understand the features used during training.
 
 import os
 import sys
-import glob
-import pickle
+import functools
 import logging
+import joblib
 import pandas as pd
 import numpy as np
 
@@ -26,23 +26,50 @@ logging.basicConfig(
 )
 logger = logging.getLogger('ml_model_inspector')
 
+# Models saved by train_ml_models.py, plus the older pickled ones
+MODEL_EXTENSIONS = ('.joblib', '.pkl')
+
+def find_latest_model_file(model_type, models_dir):
+    """Return (path, mtime_ns) of the newest model file of a type, or (None, None)."""
+    prefix = f"{model_type}_"
+    latest = (None, None)
+    if not os.path.isdir(models_dir):
+        return latest
+    
+    # One directory read; DirEntry.stat() reuses what scandir already fetched
+    with os.scandir(models_dir) as entries:
+        for entry in entries:
+            # The timestamp must follow the prefix directly, which skips the older
+            # per-food-type models (food_preference_<food>_<timestamp>)
+            if (entry.name.startswith(prefix) and entry.name[len(prefix):][:1].isdigit()
+                    and entry.name.endswith(MODEL_EXTENSIONS) and entry.is_file()):
+                mtime_ns = entry.stat().st_mtime_ns
+                if latest[1] is None or mtime_ns > latest[1]:
+                    latest = (entry.path, mtime_ns)
+    
+    return latest
+
+@functools.lru_cache(maxsize=8)
+def load_model_file(model_path, mtime_ns):
+    """Load a model file; mtime_ns is part of the cache key so rewrites reload.
+    
+    joblib reads plain pickles too, and memory-maps the arrays of models that
+    were saved uncompressed with joblib.dump instead of copying them in.
+    """
+    return joblib.load(model_path, mmap_mode='r')
+
 def load_latest_model(model_type, models_dir):
     """Load the latest model of the specified type."""
     try:
-        # Find all models of the specified type
-        pattern = os.path.join(models_dir, f"{model_type}_*.pkl")
-        model_files = glob.glob(pattern)
+        # Find the newest model of the specified type
+        latest_model_file, mtime_ns = find_latest_model_file(model_type, models_dir)
         
-        if not model_files:
+        if latest_model_file is None:
             logger.warning(f"No {model_type} models found in {models_dir}")
             return None, None
         
-        # Sort by modification time (newest first)
-        latest_model_file = max(model_files, key=os.path.getmtime)
-        
         # Load the model
-        with open(latest_model_file, 'rb') as f:
-            model = pickle.load(f)
+        model = load_model_file(latest_model_file, mtime_ns)
         
         logger.info(f"Loaded {model_type} model from {latest_model_file}")
         return model, latest_model_file
@@ -117,7 +144,7 @@ def main():
         portion_model, portion_model_path = result
         inspect_model(portion_model, portion_model_path)
     
-    # Load food preference models
+    # Load food preference model
     result = load_latest_model('food_preference', models_dir)
     if result[0]:
         food_model, food_model_path = result
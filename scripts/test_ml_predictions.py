@@ -10,7 +10,6 @@ import os
 import sys
 import logging
 import json
-import pickle
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -30,86 +29,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger('ml_prediction_test')
 
-def create_test_input():
-    """Create a sample input for testing predictions."""
-    # Create a sample cat with feeding history
-    cat_id = 1
-    cat_name = "TestCat"
-    
-    # Current time info
-    now = datetime.now()
-    day_of_week = now.weekday()
-    hour_of_day = now.hour
-    
-    return {
-        'cat_id': cat_id,
-        'day_of_week': day_of_week,
-        'hour_of_day': hour_of_day
-    }
-
-def test_time_prediction(ml_engine, features):
-    """Test the time prediction model."""
-    try:
-        # Get prediction for next feeding time
-        cat_id = features['cat_id']
-        day_of_week = features['day_of_week']
-        
-        prediction, confidence = ml_engine.predict_optimal_feeding_time(cat_id, day_of_week)
-        
-        if prediction is not None:
-            logger.info(f"Time prediction: {prediction} (confidence: {confidence:.2f})")
-            return True
-        else:
-            logger.error("Failed to get time prediction")
-            return False
-    except Exception as e:
-        logger.error(f"Error in time prediction test: {e}")
-        return False
-
-def test_portion_prediction(ml_engine, features):
-    """Test the portion prediction model."""
-    try:
-        # Get prediction for portion size
-        cat_id = features['cat_id']
-        hour_of_day = features['hour_of_day']
-        day_of_week = features['day_of_week']
-        
-        prediction, confidence = ml_engine.recommend_portion_size(cat_id, hour_of_day, day_of_week)
-        
-        if prediction is not None:
-            logger.info(f"Portion prediction: {prediction:.2f} grams (confidence: {confidence:.2f})")
-            return True
-        else:
-            logger.error("Failed to get portion prediction")
-            return False
-    except Exception as e:
-        logger.error(f"Error in portion prediction test: {e}")
-        return False
+def create_test_inputs(cat_ids, timestamps):
+    """Create one test input row per (cat_id, timestamp) pair as a DataFrame."""
+    times = pd.DatetimeIndex(timestamps)
+    return pd.DataFrame({
+        'cat_id': np.asarray(cat_ids),
+        'day_of_week': times.dayofweek.to_numpy(),
+        'hour_of_day': times.hour.to_numpy()
+    })
 
-def test_food_preference(ml_engine, features):
-    """Test the food preference model."""
+def test_batch_predictions(ml_engine, test_inputs):
+    """Test the time, portion and food preference models on every input at once."""
     try:
-        # Get prediction for food preference
-        cat_id = features['cat_id']
-        hour_of_day = features['hour_of_day']
-        day_of_week = features['day_of_week']
+        predictions = ml_engine.predict_batch(test_inputs)
         
-        prediction, confidence = ml_engine.suggest_food_type(cat_id, hour_of_day, day_of_week)
+        for features, prediction in zip(test_inputs.itertuples(index=False),
+                                        predictions.itertuples(index=False)):
+            logger.info(f"Input {features._asdict()}: time {prediction.feeding_time}, "
+                        f"portion {prediction.portion} grams, food {prediction.food_type} "
+                        f"(confidence: {prediction.food_confidence})")
         
-        if prediction is not None:
-            logger.info(f"Food preference prediction: {prediction} (confidence: {confidence:.2f})")
-            return True
-        else:
-            logger.error("Failed to get food preference prediction")
+        missing = [column for column in predictions.columns if predictions[column].isna().any()]
+        if missing:
+            logger.error(f"Failed to get predictions for: {', '.join(missing)}")
             return False
+        return True
     except Exception as e:
-        logger.error(f"Error in food preference test: {e}")
+        logger.error(f"Error in batch prediction test: {e}")
         return False
 
-def test_recommendations(ml_engine, features):
+def test_recommendations(ml_engine, cat_id):
     """Test getting all recommendations."""
     try:
-        cat_id = features['cat_id']
         recommendations = ml_engine.get_recommendations(cat_id)
         
         if recommendations:
@@ -133,23 +84,18 @@ def main():
     ml_engine = MLEngine(db_manager)
     
     try:
-        # Create test input
-        features = create_test_input()
-        logger.info(f"Created test input: {features}")
-        
-        # Test time prediction
-        time_success = test_time_prediction(ml_engine, features)
-        
-        # Test portion prediction
-        portion_success = test_portion_prediction(ml_engine, features)
+        # Create test inputs for a sample cat at the current time
+        test_inputs = create_test_inputs([1], [datetime.now()])
+        logger.info(f"Created {len(test_inputs)} test input(s)")
         
-        # Test food preference
-        food_success = test_food_preference(ml_engine, features)
+        # Test the time, portion and food preference models in one batch
+        all_success = test_batch_predictions(ml_engine, test_inputs)
         
-        # Test getting all recommendations
-        rec_success = test_recommendations(ml_engine, features)
+        # Test getting all recommendations for each cat
+        for cat_id in test_inputs['cat_id'].unique():
+            all_success = test_recommendations(ml_engine, int(cat_id)) and all_success
         
-        if time_success and portion_success and food_success and rec_success:
+        if all_success:
             logger.info("All ML prediction tests completed successfully")
         else:
             logger.warning("Some ML prediction tests failed")
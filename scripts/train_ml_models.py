@@ -11,22 +11,28 @@ import sys
 import argparse
 import logging
 import json
+import hashlib
 import pickle
 import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+import joblib
+from sklearn.ensemble import (
+    RandomForestClassifier, HistGradientBoostingClassifier, HistGradientBoostingRegressor
+)
+from sklearn.inspection import permutation_importance
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, accuracy_score, f1_score
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from threadpoolctl import threadpool_limits
 
 # Add the parent directory to sys.path to import project modules
 script_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(script_dir)
 sys.path.insert(0, project_root)
 
-from core.db_manager import DatabaseManager
+from core.db_manager import DatabaseManager, connect
 
 # Configure logging
 logging.basicConfig(
@@ -35,46 +41,93 @@ logging.basicConfig(
 )
 logger = logging.getLogger('ml_model_training')
 
+# Features shared by every model, in training column order
+FEATURE_COLUMNS = ['cat_id', 'day_of_week', 'hour']
+
+# Boosting models treat day_of_week and hour as categories; cat_id is a rowid
+# and can exceed the bins a categorical feature is limited to
+CATEGORICAL_FEATURES = [False, True, True]
+
+# Feedings a food type needs before it counts toward the preference model
+MIN_CLASS_SAMPLES = 5
+
+# Histogram bins per feature; enough for 24 hour categories, and smaller
+# histograms make split finding cheaper
+HISTOGRAM_BINS = 64
+
+# Feeding logs that have the ML metrics filled in
+TRAINING_DATA_SQL = '''
+    SELECT fl.id, fl.cat_id, fl.food_type, fl.timestamp, fl.amount,
+           fl.meal_duration_minutes, fl.consumption_rate_grams_per_minute,
+           fl.leftover_amount_grams, c.name as cat_name
+    FROM feeding_logs fl
+    JOIN cats c ON fl.cat_id = c.id
+    WHERE fl.meal_duration_minutes IS NOT NULL
+      AND fl.consumption_rate_grams_per_minute IS NOT NULL
+      AND fl.leftover_amount_grams IS NOT NULL
+    ORDER BY fl.timestamp
+'''
+
+# One row per saved model, batched with executemany
+INSERT_MODEL_SQL = '''
+    INSERT INTO ml_models (
+        model_type, model_path, accuracy_metric, 
+        training_date, is_active, feature_importance, 
+        additional_info
+    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Data signature of the last successful run, kept next to the models
+SIGNATURE_FILE = 'training_signature.json'
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Train ML models for AutomatiCats')
     parser.add_argument('--debug', action='store_true', help='Enable debug mode with sample data')
     parser.add_argument('--force', action='store_true', help='Force retraining even if recent models exist')
+    parser.add_argument('--jobs', type=int, default=-1,
+                        help='Total threads across all training processes, including the '
+                             'OpenMP pools of the gradient boosting models (-1 uses every core)')
     return parser.parse_args()
 
-def get_training_data(db_manager):
+def downcast_training_data(df):
+    """Shrink the training columns to the smallest dtypes that hold their values."""
+    # cat_id is a rowid, so let pandas pick the narrowest integer that fits
+    df['cat_id'] = pd.to_numeric(df['cat_id'], downcast='integer')
+    df[['hour', 'day_of_week']] = df[['hour', 'day_of_week']].astype(np.int8)
+    df['is_weekend'] = df['is_weekend'].astype(bool)
+    for column in ('amount', 'meal_duration_minutes',
+                   'consumption_rate_grams_per_minute', 'leftover_amount_grams'):
+        if column in df:
+            df[column] = df[column].astype(np.float32)
+    return df
+
+def get_training_data(db_manager, chunksize=50000):
     """Get training data from the database."""
     try:
-        cursor = db_manager.conn.cursor()
-        
-        # Get feeding logs with ML metrics
-        cursor.execute('''
-            SELECT fl.*, c.name as cat_name
-            FROM feeding_logs fl
-            JOIN cats c ON fl.cat_id = c.id
-            WHERE fl.meal_duration_minutes IS NOT NULL
-              AND fl.consumption_rate_grams_per_minute IS NOT NULL
-              AND fl.leftover_amount_grams IS NOT NULL
-            ORDER BY fl.timestamp
-        ''')
-        logs = cursor.fetchall()
+        # Stream feeding logs with ML metrics and narrow each chunk before it is kept,
+        # so peak memory stays close to the final downcast DataFrame. The read goes
+        # through its own query-only connection without a row factory
+        frames = []
+        conn = connect(db_manager.db_path, read_only=True)
+        try:
+            for chunk in pd.read_sql_query(TRAINING_DATA_SQL, conn,
+                                           parse_dates=['timestamp'], chunksize=chunksize):
+                # Extract time features, decoding the day of week only once
+                day_of_week = chunk['timestamp'].dt.dayofweek.astype(np.int8)
+                chunk['hour'] = chunk['timestamp'].dt.hour.astype(np.int8)
+                chunk['day_of_week'] = day_of_week
+                chunk['is_weekend'] = day_of_week >= 5
+                frames.append(downcast_training_data(chunk))
+        finally:
+            conn.close()
         
-        if not logs:
+        if not frames or sum(len(frame) for frame in frames) == 0:
             logger.warning("No feeding logs with ML metrics found")
             return None
         
-        logger.info(f"Retrieved {len(logs)} feeding logs for training")
-        
-        # Convert to DataFrame
-        df = pd.DataFrame([dict(row) for row in logs])
-        
-        # Convert timestamp to datetime
-        if 'timestamp' in df.columns:
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            # Extract time features
-            df['hour'] = df['timestamp'].dt.hour
-            df['day_of_week'] = df['timestamp'].dt.dayofweek
-            df['is_weekend'] = df['timestamp'].dt.dayofweek >= 5
+        df = pd.concat(frames, ignore_index=True, copy=False)
+        logger.info(f"Retrieved {len(df)} feeding logs for training")
         
         return df
     
@@ -82,306 +135,245 @@ def get_training_data(db_manager):
         logger.error(f"Error getting training data: {e}")
         return None
 
-def preprocess_data(df):
-    """Preprocess the data for training."""
-    try:
-        # Handle categorical features
-        cat_features = ['food_type', 'cat_id']
-        num_features = ['amount', 'hour', 'day_of_week']
-        
-        # One-hot encode categorical features
-        df_encoded = pd.get_dummies(df, columns=cat_features, drop_first=False)
-        
-        # Select features for different models
-        time_features = [col for col in df_encoded.columns if col.startswith('hour') or 
-                         col.startswith('day_of_week') or col.startswith('cat_id')]
-        
-        portion_features = [col for col in df_encoded.columns if col.startswith('cat_id') or 
-                           col.startswith('food_type') or 'amount' in col or 
-                           'consumption_rate' in col or 'leftover' in col]
-        
-        food_features = [col for col in df_encoded.columns if col.startswith('cat_id') or 
-                        'amount' in col or 'leftover' in col or 'meal_duration' in col]
-        
-        return {
-            'full_data': df_encoded,
-            'time_features': time_features,
-            'portion_features': portion_features,
-            'food_features': food_features
-        }
-    
-    except Exception as e:
-        logger.error(f"Error preprocessing data: {e}")
-        return None
+def _permutation_importance(model, X_test, y_test, n_jobs=-1):
+    """Feature importance for models that don't expose feature_importances_."""
+    result = permutation_importance(model, X_test, y_test, n_repeats=5, n_jobs=n_jobs, random_state=42)
+    return dict(zip(FEATURE_COLUMNS, result.importances_mean.tolist()))
+
+def _limit_worker_threads(n_threads):
+    """Cap the OpenMP/BLAS pools of a training worker process."""
+    # HistGradientBoosting ignores n_jobs and sizes its OpenMP pool to every core
+    threadpool_limits(limits=n_threads)
 
-def train_time_model(data):
+def train_time_model(X, y, idx_train, idx_test, n_jobs=-1):
     """Train a model to predict optimal feeding times."""
     logger.info("Training time prediction model...")
     
-    # Prepare features and target
-    X = data[['cat_id', 'day_of_week', 'hour']]
-    y = data['hour']  # Predict the hour of feeding
-    
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Train model
-    model = RandomForestClassifier(n_estimators=100, random_state=42)
-    model.fit(X_train_scaled, y_train)
+    # Train model (tree ensembles are scale-invariant, so no scaler is needed)
+    model = HistGradientBoostingClassifier(
+        max_iter=100, max_bins=HISTOGRAM_BINS, categorical_features=CATEGORICAL_FEATURES,
+        random_state=42
+    )
+    model.fit(X[idx_train], y[idx_train])
     
     # Evaluate
-    y_pred = model.predict(X_test_scaled)
-    accuracy = accuracy_score(y_test, y_pred)
+    y_pred = model.predict(X[idx_test])
+    accuracy = accuracy_score(y[idx_test], y_pred)
     logger.info(f"Time prediction model trained with accuracy: {accuracy:.4f}")
     
     # Get feature importance
-    feature_importance = dict(zip(X.columns, model.feature_importances_))
+    feature_importance = _permutation_importance(model, X[idx_test], y[idx_test], n_jobs)
     
     return {
         'model_type': 'time_prediction',
         'model': model,
         'accuracy': accuracy,
-        'feature_importance': feature_importance,
-        'scaler': scaler
+        'feature_importance': feature_importance
     }
 
-def train_portion_model(data):
+def train_portion_model(X, y, idx_train, idx_test, n_jobs=-1):
     """Train a model to recommend portion sizes."""
     logger.info("Training portion size prediction model...")
     
-    # Prepare features and target
-    X = data[['cat_id', 'day_of_week', 'hour']]
-    y = data['amount']  # Predict the portion size
-    
-    # Split data
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    # Scale features
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-    
-    # Train model
-    model = RandomForestRegressor(n_estimators=100, random_state=42)
-    model.fit(X_train_scaled, y_train)
+    # Train model (tree ensembles are scale-invariant, so no scaler is needed)
+    model = HistGradientBoostingRegressor(
+        max_iter=100, max_bins=HISTOGRAM_BINS, categorical_features=CATEGORICAL_FEATURES,
+        random_state=42
+    )
+    model.fit(X[idx_train], y[idx_train])
     
     # Evaluate
-    y_pred = model.predict(X_test_scaled)
-    rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+    y_pred = model.predict(X[idx_test])
+    rmse = np.sqrt(mean_squared_error(y[idx_test], y_pred))
     logger.info(f"Portion size model trained with RMSE: {rmse:.4f}")
     
     # Get feature importance
-    feature_importance = dict(zip(X.columns, model.feature_importances_))
+    feature_importance = _permutation_importance(model, X[idx_test], y[idx_test], n_jobs)
     
     return {
         'model_type': 'portion_prediction',
         'model': model,
         'rmse': rmse,
-        'feature_importance': feature_importance,
-        'scaler': scaler
+        'feature_importance': feature_importance
     }
 
-def train_food_preference_model(data):
-    """Train models to predict food preferences."""
-    logger.info("Training food preference prediction models...")
-    
-    # Prepare features
-    X = data[['cat_id', 'day_of_week', 'hour']]
+def train_food_preference_model(X, y, n_jobs=-1):
+    """Train a model to predict food preferences."""
+    logger.info("Training food preference prediction model...")
+    
+    # A forest can't learn a preference unless at least two food types have
+    # enough feedings to split on; otherwise it would only memorize noise
+    _, counts = np.unique(y, return_counts=True)
+    if np.count_nonzero(counts >= MIN_CLASS_SAMPLES) < 2:
+        logger.warning("Not enough feedings of different food types, skipping food preference model")
+        return None
     
-    # Scale features once for all models
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
+    # Train a single multiclass model on every row; classes_ holds the food type labels.
+    # Trees are scale-invariant, so the forest is saved bare without a scaler.
+    # Each tree sees a half-size bootstrap sample, which roughly halves build time
+    model = RandomForestClassifier(n_estimators=100, oob_score=True, bootstrap=True,
+                                   max_samples=0.5, n_jobs=n_jobs, random_state=42)
+    model.fit(X, y)
     
-    # Train a model for each food type
-    food_types = ['Dry Food', 'Wet Food', 'Treats']
-    models = {}
+    # Evaluate on the out-of-bag samples instead of a held-out split
+    accuracy = model.oob_score_
+    logger.info(f"Food preference model trained with OOB accuracy: {accuracy:.4f}")
     
-    for food_type in food_types:
-        # Create binary target: 1 if this food type was chosen, 0 otherwise
-        y = (data['food_type'] == food_type).astype(int)
-        
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, test_size=0.2, random_state=42)
-        
-        # Train model
-        model = RandomForestClassifier(n_estimators=100, random_state=42)
-        model.fit(X_train, y_train)
-        
-        # Evaluate
-        y_pred = model.predict(X_test)
-        accuracy = accuracy_score(y_test, y_pred)
-        logger.info(f"Food preference model for {food_type} trained with accuracy: {accuracy:.4f}")
-        
-        # Get feature importance
-        feature_importance = dict(zip(X.columns, model.feature_importances_))
-        
-        # Store model info
-        models[food_type] = {
-            'model': model,
-            'accuracy': accuracy,
-            'feature_importance': feature_importance
-        }
+    # Get feature importance
+    feature_importance = dict(zip(FEATURE_COLUMNS, model.feature_importances_))
     
     return {
         'model_type': 'food_preference',
-        'models': models,
-        'scaler': scaler
+        'model': model,
+        'accuracy': accuracy,
+        'feature_importance': feature_importance,
+        'food_types': model.classes_.tolist()
     }
 
-def save_models(db_manager, models_dir, models, debug_mode=False, sample_size=200):
+def save_models(db_manager, models_dir, models, sample_size=200):
     """Save trained models to disk and record in database."""
     if not os.path.exists(models_dir):
         os.makedirs(models_dir)
     
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    cursor = db_manager.conn.cursor()
-    feeding_logs = []  # Default empty list
+    # One clock read for file names and database records alike
+    now = datetime.now()
+    timestamp = now.strftime('%Y%m%d_%H%M%S')
+    training_date = now.strftime('%Y-%m-%d %H:%M:%S')
+    ml_models_rows = []
     
     try:
-        # Check if ml_models table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='ml_models'")
-        if not cursor.fetchone():
-            logger.warning("ml_models table does not exist, creating it...")
-            # Create the table if it doesn't exist
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ml_models (
-                    model_id INTEGER PRIMARY KEY,
-                    model_type TEXT NOT NULL,
-                    model_path TEXT NOT NULL,
-                    accuracy_metric TEXT,
-                    training_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    is_active INTEGER DEFAULT 1,
-                    feature_importance TEXT,
-                    additional_info TEXT
-                )
-            ''')
-        
         # Save each model
         for model_info in models:
             model_type = model_info['model_type']
+            model = model_info['model']
+            model_path = os.path.join(models_dir, f"{model_type}_{timestamp}.joblib")
+            
+            # Uncompressed, so MLEngine can memory-map the estimators' numpy arrays
+            joblib.dump(model, model_path, protocol=pickle.HIGHEST_PROTOCOL)
             
             if model_type == 'time_prediction' or model_type == 'portion_prediction':
-                model = model_info['model']
-                model_path = os.path.join(models_dir, f"{model_type}_{timestamp}.pkl")
-                
-                with open(model_path, 'wb') as f:
-                    pickle.dump(model, f)
-                
-                # Record in database
-                metrics = json.dumps({
+                metrics = {
                     'accuracy': model_info.get('accuracy', 0),
                     'rmse': model_info.get('rmse', 0)
-                })
-                
-                cursor.execute('''
-                    INSERT INTO ml_models (
-                        model_type, model_path, accuracy_metric, 
-                        training_date, is_active, feature_importance
-                    ) VALUES (?, ?, ?, ?, ?, ?)
-                ''', (
-                    model_type,
-                    model_path,
-                    metrics,
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    1,  # Active
-                    json.dumps(model_info['feature_importance'])
-                ))
-                
-                logger.info(f"Saved {model_type} model to {model_path}")
+                }
+                additional_info = None
                 
             elif model_type == 'food_preference':
-                # Save multiple models
-                models_dict = model_info['models']
-                
-                for food_name, food_model_info in models_dict.items():
-                    model = food_model_info['model']
-                    model_path = os.path.join(models_dir, f"{model_type}_{food_name}_{timestamp}.pkl")
-                    
-                    with open(model_path, 'wb') as f:
-                        pickle.dump(model, f)
-                    
-                    # Record in database
-                    metrics = json.dumps({
-                        'accuracy': food_model_info.get('accuracy', 0),
-                        'f1_score': food_model_info.get('f1_score', 0)
-                    })
-                    
-                    cursor.execute('''
-                        INSERT INTO ml_models (
-                            model_type, model_path, accuracy_metric, 
-                            training_date, is_active, feature_importance, 
-                            additional_info
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        f"{model_type}_{food_name}",
-                        model_path,
-                        metrics,
-                        datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        1,  # Active
-                        json.dumps(food_model_info['feature_importance']),
-                        food_name
-                    ))
-                    
-                    logger.info(f"Saved {model_type} model for {food_name} to {model_path}")
-        
-        # Save the scaler
-        if 'scaler' in model_info:
-            scaler = model_info['scaler']
-            scaler_path = os.path.join(models_dir, 'scaler.pkl')
-            with open(scaler_path, 'wb') as f:
-                pickle.dump(scaler, f)
-            logger.info(f"Saved feature scaler to {scaler_path}")
+                metrics = {
+                    'accuracy': model_info.get('accuracy', 0)
+                }
+                additional_info = json.dumps(model_info['food_types'])
+            
+            # Queue the database record
+            ml_models_rows.append((
+                model_type,
+                model_path,
+                json.dumps(metrics),
+                training_date,
+                1,  # Active
+                json.dumps(model_info['feature_importance']),
+                additional_info
+            ))
+            
+            logger.info(f"Saved {model_type} model to {model_path}")
         
-        # Record training session
-        cursor.execute('''
-            INSERT INTO ml_training_sessions (
-                started_at, completed_at, status, data_points_used
-            ) VALUES (?, ?, ?, ?)
-        ''', (
-            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'completed',
-            sample_size if debug_mode else len(feeding_logs)
-        ))
+        # Record everything in one transaction; the connection commits or rolls back
+        with db_manager.conn:
+            cursor = db_manager.conn.cursor()
+            # Take the write lock up front so the batch can't fail midway on a busy database
+            if not db_manager.conn.in_transaction:
+                cursor.execute('BEGIN IMMEDIATE')
+            
+            # Check if ml_models table exists
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='ml_models'")
+            if not cursor.fetchone():
+                logger.warning("ml_models table does not exist, creating it...")
+                # Create the table if it doesn't exist
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS ml_models (
+                        model_id INTEGER PRIMARY KEY,
+                        model_type TEXT NOT NULL,
+                        model_path TEXT NOT NULL,
+                        accuracy_metric TEXT,
+                        training_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        is_active INTEGER DEFAULT 1,
+                        feature_importance TEXT,
+                        additional_info TEXT
+                    )
+                ''')
+            
+            cursor.executemany(INSERT_MODEL_SQL, ml_models_rows)
+            
+            # Record training session
+            cursor.execute('''
+                INSERT INTO ml_training_sessions (
+                    timestamp, models_trained, success, status, data_points_used
+                ) VALUES (?, ?, ?, ?, ?)
+            ''', (
+                training_date,
+                len(ml_models_rows),
+                1,
+                'completed',
+                sample_size
+            ))
         
-        db_manager.conn.commit()
         logger.info(f"Recorded model information in database")
+        return True
         
     except Exception as e:
         logger.error(f"Error saving models: {e}")
-        db_manager.conn.rollback()
+        return False
+
+def training_data_signature(df):
+    """Fingerprint the contents of every column the models train on."""
+    # Hashing the values (not just count and newest id) also catches edited
+    # amounts or food types and deletes followed by inserts
+    columns = ['id', 'timestamp', 'amount', 'food_type'] + FEATURE_COLUMNS
+    row_hashes = pd.util.hash_pandas_object(df[columns], index=False)
+    return hashlib.sha1(row_hashes.to_numpy().tobytes()).hexdigest()[:16]
+
+def load_training_signature(models_dir):
+    """Return the data signature recorded by the last successful training run."""
+    try:
+        with open(os.path.join(models_dir, SIGNATURE_FILE)) as f:
+            return json.load(f).get('signature')
+    except (OSError, ValueError):
+        return None
+
+def save_training_signature(models_dir, signature):
+    """Record the data signature of a successful training run."""
+    with open(os.path.join(models_dir, SIGNATURE_FILE), 'w') as f:
+        json.dump({'signature': signature, 'trained_at': datetime.now().isoformat()}, f)
 
 def generate_sample_data(size=100):
-    """Generate sample data for debug mode."""
-    np.random.seed(42)
+    """Generate sample data for debug mode, already in the training dtypes."""
+    rng = np.random.default_rng(42)
     
     # Generate cat IDs
-    cat_ids = np.random.choice([1, 2, 3], size=size)
+    cat_ids = rng.choice(np.array([1, 2, 3], dtype=np.int8), size=size)
     
-    # Generate food types
-    food_types = np.random.choice(['Dry Food', 'Wet Food', 'Treats'], size=size)
+    # Generate food types by indexing into the label array
+    foods = np.array(['Dry Food', 'Wet Food', 'Treats'])
+    food_types = foods[rng.integers(0, len(foods), size=size)]
     
     # Generate timestamps
-    base_date = pd.Timestamp('2025-01-01')
-    timestamps = [base_date + pd.Timedelta(days=np.random.randint(0, 30), 
-                                          hours=np.random.randint(0, 24)) 
-                 for _ in range(size)]
+    days = rng.integers(0, 30, size=size)
+    hours = rng.integers(0, 24, size=size)
+    timestamps = pd.DatetimeIndex(
+        pd.Timestamp('2025-01-01') + pd.to_timedelta(days, unit='D') + pd.to_timedelta(hours, unit='h')
+    )
+    day_of_week = timestamps.dayofweek.to_numpy().astype(np.int8)
     
     # Generate amounts
-    amounts = np.random.uniform(20, 100, size=size)
+    amounts = rng.uniform(20, 100, size=size).astype(np.float32)
     
     # Generate ML metrics
-    meal_durations = np.random.uniform(2, 15, size=size)
+    meal_durations = rng.uniform(2, 15, size=size).astype(np.float32)
     consumption_rates = amounts / meal_durations
-    leftover_amounts = np.random.uniform(0, 0.3, size=size) * amounts
+    leftover_amounts = rng.uniform(0, 0.3, size=size).astype(np.float32) * amounts
     
     # Create DataFrame
-    df = pd.DataFrame({
+    return pd.DataFrame({
         'cat_id': cat_ids,
         'food_type': food_types,
         'timestamp': timestamps,
@@ -389,12 +381,10 @@ def generate_sample_data(size=100):
         'meal_duration_minutes': meal_durations,
         'consumption_rate_grams_per_minute': consumption_rates,
         'leftover_amount_grams': leftover_amounts,
-        'hour': [ts.hour for ts in timestamps],
-        'day_of_week': [ts.dayofweek for ts in timestamps],
-        'is_weekend': [ts.dayofweek >= 5 for ts in timestamps]
+        'hour': timestamps.hour.to_numpy().astype(np.int8),
+        'day_of_week': day_of_week,
+        'is_weekend': day_of_week >= 5
     })
-    
-    return df
 
 def main():
     """Main function to train ML models."""
@@ -427,14 +417,47 @@ def main():
                 db_manager.close()
                 return
         
-        # Train models directly with the dataframe
-        time_model = train_time_model(df)
-        portion_model = train_portion_model(df)
-        food_model = train_food_preference_model(df)
-        
-        # Save models
+        # Skip retraining when no feeding data has changed since the last run
         models_dir = os.path.join(project_root, 'data', 'models')
-        save_models(db_manager, models_dir, [time_model, portion_model, food_model], args.debug, sample_size)
+        signature = None if args.debug else training_data_signature(df)
+        if signature and not args.force and signature == load_training_signature(models_dir):
+            logger.info("Training data unchanged since the last run, skipping (use --force to retrain)")
+            return
+        
+        # Extract the features and targets once and share one split across all models.
+        # A single-dtype frame converts to a column-major array, so ask for C order
+        # to hand sklearn a buffer it can use without another copy
+        X = np.ascontiguousarray(df[FEATURE_COLUMNS].to_numpy(dtype=np.float32))
+        idx_train, idx_test = train_test_split(np.arange(len(df)), test_size=0.2, random_state=42)
+        
+        # The three models are independent, so train them in separate processes
+        # and split the cores between them to avoid oversubscription
+        cores = os.cpu_count() or 1
+        if args.jobs > 0:
+            cores = min(args.jobs, cores)
+        workers = min(3, cores)
+        stage_jobs = max(1, cores // workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_limit_worker_threads,
+                                 initargs=(stage_jobs,)) as executor:
+            futures = {
+                executor.submit(train_time_model, X, df['hour'].to_numpy(),
+                                idx_train, idx_test, stage_jobs): 'time',
+                executor.submit(train_portion_model, X, df['amount'].to_numpy(),
+                                idx_train, idx_test, stage_jobs): 'portion',
+                executor.submit(train_food_preference_model, X, df['food_type'].to_numpy(),
+                                stage_jobs): 'food'
+            }
+            trained = {tag: future.result() for future, tag in futures.items()}
+        
+        time_model = trained['time']
+        portion_model = trained['portion']
+        food_model = trained['food']
+        
+        # Save models, leaving out any stage that was skipped
+        trained_models = [model for model in (time_model, portion_model, food_model) if model is not None]
+        saved = save_models(db_manager, models_dir, trained_models, sample_size)
+        if saved and signature:
+            save_training_signature(models_dir, signature)
         
         logger.info("ML model training completed successfully")
     
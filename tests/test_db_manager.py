@@ -65,6 +65,25 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertIn("Mittens", cat_names)
         self.assertIn("Felix", cat_names)
     
+    def test_get_all_cats_reflects_changes(self):
+        """Test that the cached cat list picks up adds, updates and deletes"""
+        cat_id = self.db_manager.add_cat(name="Whiskers")
+        
+        # Populate the cache
+        self.assertEqual([cat['name'] for cat in self.db_manager.get_all_cats()], ["Whiskers"])
+        
+        # Add a cat
+        felix_id = self.db_manager.add_cat(name="Felix")
+        self.assertEqual([cat['name'] for cat in self.db_manager.get_all_cats()], ["Felix", "Whiskers"])
+        
+        # Update a cat
+        self.db_manager.update_cat(cat_id, name="Alfie")
+        self.assertEqual([cat['name'] for cat in self.db_manager.get_all_cats()], ["Alfie", "Felix"])
+        
+        # Delete a cat
+        self.db_manager.delete_cat(felix_id)
+        self.assertEqual([cat['name'] for cat in self.db_manager.get_all_cats()], ["Alfie"])
+    
     def test_update_cat(self):
         """Test updating a cat"""
         # Add a cat
@@ -235,6 +254,30 @@ class TestDatabaseManager(unittest.TestCase):
         # Verify food inventory was updated
         food = self.db_manager.get_food_inventory(food_id)
         self.assertEqual(food['current_amount'], 450.0)  # 500 - 50
+    
+    def test_feeding_logs_pagination_with_equal_timestamps(self):
+        """Test that keyset pages don't skip rows logged in the same second"""
+        cat_id = self.db_manager.add_cat(name="Whiskers")
+        self.db_manager.add_food_inventory("Dry Kibble", 500.0, 1000.0, 100.0)
+        
+        self.db_manager.log_feedings([
+            (cat_id, "Dry Kibble", 10.0, None, False, None) for _ in range(5)
+        ])
+        # Pin every row to the same second, as a batch logged at once would be
+        self.db_manager.conn.execute("UPDATE feeding_logs SET timestamp = '2024-01-01 08:00:00'")
+        self.db_manager.conn.commit()
+        
+        seen = []
+        before = None
+        while True:
+            page = self.db_manager.get_feeding_logs(cat_id, limit=2, before=before)
+            if not page:
+                break
+            seen.extend(log['id'] for log in page)
+            before = (page[-1]['timestamp'], page[-1]['id'])
+        
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(seen, sorted(seen, reverse=True))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Tests for the ML schema migration
+"""
+
+import os
+import sys
+import sqlite3
+import unittest
+import tempfile
+
+# Add parent directory to path to allow imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.db_manager import DatabaseManager
+from core.schema_migrate import apply_schema_updates
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), '..', 'database', 'schema_update_ml.sql')
+
+class TestSchemaMigrate(unittest.TestCase):
+    """Test cases for apply_schema_updates"""
+
+    def setUp(self):
+        """Set up an app database in a temporary file"""
+        self.db_fd, self.db_path = tempfile.mkstemp()
+        DatabaseManager(self.db_path).close()
+
+    def tearDown(self):
+        """Clean up after tests"""
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def _schema(self):
+        """Return (feeding_logs columns, table names, index names) of the test database"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(feeding_logs)")]
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+            return columns, tables, indexes
+        finally:
+            conn.close()
+
+    def test_apply_schema_updates(self):
+        """Test that the ML columns, tables and indexes are created"""
+        self.assertTrue(apply_schema_updates(self.db_path, SCHEMA_PATH))
+
+        columns, tables, indexes = self._schema()
+        self.assertIn('meal_duration_minutes', columns)
+        self.assertIn('consumption_rate_grams_per_minute', columns)
+        self.assertIn('leftover_amount_grams', columns)
+        self.assertTrue({'ml_models', 'ml_training_sessions', 'feeding_patterns'} <= tables)
+        self.assertTrue({'idx_patterns_cat', 'idx_feeding_logs_ml'} <= indexes)
+
+    def test_reapply_is_idempotent(self):
+        """Test that applying the updates twice skips what already exists"""
+        self.assertTrue(apply_schema_updates(self.db_path, SCHEMA_PATH))
+        first = self._schema()
+
+        with self.assertLogs('automaticats.schema_migrate', level='INFO') as logs:
+            self.assertTrue(apply_schema_updates(self.db_path, SCHEMA_PATH))
+
+        # Nothing is added twice and no statement fails
+        self.assertEqual(self._schema(), first)
+        output = "\n".join(logs.output)
+        self.assertNotIn('ERROR', output)
+        self.assertIn("Column meal_duration_minutes already exists in table feeding_logs", output)
+        self.assertIn("Table feeding_patterns already exists", output)
+        self.assertIn("Index idx_feeding_logs_ml already exists", output)
+
+    def test_missing_database(self):
+        """Test that a missing database file is reported as a failure"""
+        self.assertFalse(apply_schema_updates(self.db_path + '.missing', SCHEMA_PATH))
+
+if __name__ == '__main__':
+    unittest.main()
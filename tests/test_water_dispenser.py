@@ -5,7 +5,6 @@ Tests for the Water Dispenser functionality
 import unittest
 import os
 import sys
-import tempfile
 from datetime import datetime, timedelta
 
 # Add parent directory to path to import modules
@@ -31,17 +30,26 @@ class MockMessageBox:
 class TestWaterDispenser(unittest.TestCase):
     """Test class for Water Dispenser functionality"""
     
-    def setUp(self):
-        """Set up test environment"""
-        # Create a temporary database for testing
-        self.db_fd, self.db_path = tempfile.mkstemp()
-        self.db_manager = DatabaseManager(self.db_path)
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared database and tab once for the whole class"""
+        # An in-memory database avoids a tempfile per test
+        cls.db_manager = DatabaseManager(':memory:')
         
         # Create test cat data
-        self.cat_id = self.db_manager.add_cat("Whiskers", 3, 4.5, "Siamese", "Picky eater")
+        cls.cat_id = cls.db_manager.add_cat("Whiskers", 3, 4.5, "Siamese", "Picky eater")
         
         # Create the water dispenser tab with the test database
-        self.water_dispenser_tab = WaterDispenserTab(self.db_manager)
+        cls.water_dispenser_tab = WaterDispenserTab(cls.db_manager)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Close the shared database"""
+        cls.db_manager.close()
+    
+    def setUp(self):
+        """Reset per-test state"""
+        self.water_dispenser_tab.set_selected_cat(None)
         
         # Save the original QMessageBox.information method
         self.original_message_box = QMessageBox.information
@@ -50,10 +58,6 @@ class TestWaterDispenser(unittest.TestCase):
 
     def tearDown(self):
         """Clean up after tests"""
-        # Close and remove the temporary database
-        os.close(self.db_fd)
-        os.unlink(self.db_path)
-        
         # Restore the original QMessageBox.information method
         QMessageBox.information = self.original_message_box
     
@@ -86,36 +90,21 @@ class TestWaterDispenser(unittest.TestCase):
     
     def test_refill_button_click(self):
         """Test the refill button functionality"""
-        # Find the refill button
-        refill_button = None
-        for child in self.water_dispenser_tab.findChildren(QPushButton):
-            if child.text() == "Refill":
-                refill_button = child
-                break
+        refill_button = self.water_dispenser_tab.refill_button
+        self.assertEqual(refill_button.text(), "Refill")
         
-        self.assertIsNotNone(refill_button, "Refill button not found")
-        
-        # Click the button and verify it triggers the _on_refill_clicked method
-        if refill_button:
-            # QTest.mouseClick doesn't work well in this context, so we'll directly call the slot
-            self.water_dispenser_tab._on_refill_clicked()
-            # No assertion needed as we're using a mock message box
+        # QTest.mouseClick doesn't work well in this context, so we'll directly call the slot
+        self.water_dispenser_tab._on_refill_clicked()
+        # No assertion needed as we're using a mock message box
     
     def test_dispense_button_click(self):
         """Test the dispense button functionality"""
-        # Find the dispense button
-        dispense_button = None
-        for child in self.water_dispenser_tab.findChildren(QPushButton):
-            if child.text() == "Dispense Water":
-                dispense_button = child
-                break
-        
-        self.assertIsNotNone(dispense_button, "Dispense Water button not found")
+        dispense_button = self.water_dispenser_tab.dispense_button
+        self.assertEqual(dispense_button.text(), "Dispense Water")
         
-        # Click the button and verify it triggers the _on_dispense_clicked method
-        if dispense_button:
-            self.water_dispenser_tab._on_dispense_clicked()
-            # No assertion needed as we're using a mock message box
+        # Trigger the _on_dispense_clicked slot directly
+        self.water_dispenser_tab._on_dispense_clicked()
+        # No assertion needed as we're using a mock message box
     
     def test_set_selected_cat(self):
         """Test setting the selected cat ID"""
@@ -137,19 +126,12 @@ class TestWaterDispenser(unittest.TestCase):
     
     def test_apply_settings(self):
         """Test applying settings"""
-        # Find the apply settings button
-        apply_button = None
-        for child in self.water_dispenser_tab.findChildren(QPushButton):
-            if child.text() == "Apply Settings":
-                apply_button = child
-                break
-        
-        self.assertIsNotNone(apply_button, "Apply Settings button not found")
+        apply_button = self.water_dispenser_tab.apply_settings_button
+        self.assertEqual(apply_button.text(), "Apply Settings")
         
-        # Click the button and verify it triggers the _on_apply_settings_clicked method
-        if apply_button:
-            self.water_dispenser_tab._on_apply_settings_clicked()
-            # No assertion needed as we're using a mock message box
+        # Trigger the _on_apply_settings_clicked slot directly
+        self.water_dispenser_tab._on_apply_settings_clicked()
+        # No assertion needed as we're using a mock message box
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file